@@ -0,0 +1,150 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compare the cost of attribute access on `Object`s with field descriptors against the `__getattribute__`/`__setattr__`
+interception it replaced (copied from `Object` as it was before them).
+
+    python -m benchmarks.attribute_access
+"""
+
+import timeit
+
+from pyparse.core.data.fields import Field, NumberField
+from pyparse.core.data.object import Object
+
+
+class City(Object):
+    name = Field()
+    country_code = Field()
+    population = NumberField()
+
+
+class _ReferenceObject(object):
+    """The accessor path of `Object` before field descriptors, copied from it: every attribute access is intercepted by
+    `__getattribute__`/`__setattr__`, and fields are read and written through `get`/`set`"""
+
+    _fields_python = None
+    """:type: dict[str, Field]"""
+    _fields_parse = None
+    """:type: dict[str, Field]"""
+
+    _raw_keys = None
+    """:type: set[str] | None"""
+
+    def __init__(self, content=None):
+        self._content = dict(content or {})
+        """:type: dict"""
+        self._original_value_of_modified_content = {}
+
+    def get(self, key):
+        # `key` should be parse key
+        if self._raw_keys and key in self._raw_keys:
+            self._decode(key)
+        return self._content[key] if key in self._content else None
+
+    def set(self, key, value):
+        self._set(key, value)
+
+    def _set(self, key, value, check_readonly=True):
+        if check_readonly:
+            field = self._fields_parse.get(key, None)
+            if field and field.readonly:
+                raise KeyError('{} is a readonly field.'.format(key))
+
+        if key not in self._original_value_of_modified_content:
+            self._original_value_of_modified_content[key] = self.get(key)
+
+        if value is not None:
+            self._content[key] = value
+        else:
+            del self._content[key]
+
+    def _parse_key_from_python_key(self, python_key):
+        return self._fields_python[python_key].parse_name
+
+    def __getattribute__(self, key):
+        if key != '_fields_python' and key in self._fields_python:
+            return self.get(self._parse_key_from_python_key(key))
+        else:
+            return super(_ReferenceObject, self).__getattribute__(key)
+
+    def __setattr__(self, key, value):
+        if key in self._fields_parse:
+            return self.set(self._parse_key_from_python_key(key), value)
+        else:
+            return super(_ReferenceObject, self).__setattr__(key, value)
+
+
+def _reference_class(cls):
+    """Build the counterpart of an `Object` class on `_ReferenceObject`, with a property for each field the way
+    `ObjectBase` created them before field descriptors
+
+    >>> city = _reference_class(City)(content={'name': 'Taipei'})
+    >>> city.population = 2700000
+    >>> city.name, city.population, city._content
+    ('Taipei', 2700000, {'name': 'Taipei', 'population': 2700000})
+
+    :type cls: type
+    :rtype: type
+    """
+    # noinspection PyProtectedMember
+    fields = cls._fields_python
+    """:type: dict[str, Field]"""
+
+    def getter(field):
+        return lambda self: self.get(field.parse_name)
+
+    def setter(field):
+        return lambda self, value: self.set(field.parse_name, value)
+
+    class_dict = {
+        '_fields_python': dict(fields),
+        '_fields_parse': {field.parse_name: field for field in fields.values()},
+    }
+    for field_name, field in fields.items():
+        class_dict[field_name] = property(fget=getter(field), fset=setter(field) if not field.readonly else None)
+    return type('Reference{}'.format(cls.__name__), (_ReferenceObject,), class_dict)
+
+
+_ReferenceCity = _reference_class(City)
+
+
+def benchmarks():
+    """
+    :return: name, reference statement and current statement of each benchmark
+    :rtype: list[(str, collections.Callable, collections.Callable)]
+    """
+    content = {'objectId': 'a1b2c3', 'name': 'Taipei', 'countryCode': 'TW', 'population': 2700000}
+    reference, current = _ReferenceCity(content=content), City(content=content)
+    return [
+        ('field read', lambda: reference.country_code, lambda: current.country_code),
+        ('field write', lambda: setattr(reference, 'population', 1), lambda: setattr(current, 'population', 1)),
+        ('internal attribute read', lambda: reference._content, lambda: current._content),
+        ('method call', lambda: reference.get('name'), lambda: current.get('name')),
+    ]
+
+
+def main(repeat=5, number=200000):
+    for name, reference, current in benchmarks():
+        reference_time = min(timeit.repeat(reference, repeat=repeat, number=number)) / number
+        current_time = min(timeit.repeat(current, repeat=repeat, number=number)) / number
+        print('{:<24} reference {:>7.1f} ns  current {:>7.1f} ns  speedup {:>5.2f}x'.format(
+            name, reference_time * 1e9, current_time * 1e9, reference_time / current_time))
+
+
+if __name__ == '__main__':
+    main()
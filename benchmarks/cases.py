@@ -0,0 +1,160 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Benchmark cases of the hot paths of pyparse, run by `benchmarks.suite`.
+
+Each group is a function taking a `contextlib.ExitStack` (for setup which has to be undone after the run) and
+returning (name, statement) or (name, statement, setup) tuples, where `setup` is called once before the statement is
+timed. Everything outside the statements isn't timed.
+"""
+
+import datetime
+
+from pyparse import metrics, pyparse
+from pyparse.core.data.fields import AutoDateTimeField, DateTimeField, Field, GeoPointField, NumberField
+from pyparse.core.data.object import Object
+from pyparse.core.data.types import (GeoPoint, UTC, datetime_str_to_python, datetime_strs_to_python,
+                                     datetime_to_parse_str)
+from pyparse.fake_server import FakeParseServer
+from pyparse.transport import HTTPClientTransport, SessionPool
+from pyparse.utils.strings import camelcase, snakecase, snakify
+
+from benchmarks.instantiation import Wide, _raw_parse_dict as _wide_raw_parse_dict
+from benchmarks.stub_server import StubServer
+
+
+class Narrow(Object):
+    name = Field()
+    count = NumberField()
+
+
+class City(Object):
+    name = Field()
+    country_code = Field()
+    population = NumberField()
+    location = GeoPointField()
+    founded_at = DateTimeField()
+    labels = Field()
+
+
+def object_cases(stack):
+    narrow_raw = {'objectId': 'a1b2c3', 'createdAt': '2015-07-03T04:05:06.789Z',
+                  'updatedAt': '2015-07-03T04:05:06.789Z', 'name': 'narrow', 'count': 1}
+    wide_raw = _wide_raw_parse_dict()
+
+    city = City.from_parse({
+        'objectId': 'a1b2c3', 'createdAt': '2015-07-03T04:05:06.789Z', 'updatedAt': '2015-07-03T04:05:06.789Z',
+        'name': 'Taipei', 'countryCode': 'TW', 'population': 2700000, 'labels': ['capital'],
+        'location': {'__type': 'GeoPoint', 'latitude': 25.04, 'longitude': 121.53},
+        'foundedAt': {'__type': 'Date', 'iso': '1884-01-01T00:00:00.000Z'},
+    })
+    city.population = 2700001
+    city.name = 'Taipei City'
+    new_city = City(name='Tainan', country_code='TW', population=1880000, location=GeoPoint(22.99, 120.21),
+                    founded_at=datetime.datetime(1624, 1, 1, tzinfo=UTC()))
+
+    return [
+        ('object.from_parse.narrow', lambda: Narrow.from_parse(narrow_raw)),
+        ('object.from_parse.wide', lambda: Wide.from_parse(wide_raw)),
+        ('object.from_parse.wide.lazy', lambda: Wide.from_parse(wide_raw, lazy=True)),
+        ('object.save_payload.update', city._save_request),
+        ('object.save_payload.create', new_city._save_request),
+    ]
+
+
+def query_cases(stack):
+    def build():
+        return City.query().filter(name='Taipei', population__gte=1000000, country_code__in=['TW', 'JP'],
+                                   location__near_sphere=GeoPoint(25.04, 121.53)).order_by('-population').limit(50)
+
+    query = build()
+    return [
+        ('query.filter', build),
+        ('query.get_arguments', query.get_arguments),
+    ]
+
+
+def types_cases(stack):
+    now = datetime.datetime(2015, 7, 3, 4, 5, 6, 789000, tzinfo=UTC())
+    parse_strs = ['2015-07-03T04:05:06.789Z'] * 100
+    geo_point = GeoPoint(25.04, 121.53)
+    geo_point_dict = geo_point.to_parse()
+    return [
+        ('types.datetime_to_parse_str', lambda: datetime_to_parse_str(now)),
+        ('types.datetime_str_to_python', lambda: datetime_str_to_python('2015-07-03T04:05:06.789Z')),
+        ('types.datetime_strs_to_python.100', lambda: datetime_strs_to_python(parse_strs)),
+        ('types.date_field.to_python', lambda: DateTimeField.to_python({'__type': 'Date',
+                                                                        'iso': '2015-07-03T04:05:06.789Z'})),
+        ('types.auto_date_field.to_parse', lambda: AutoDateTimeField.to_parse(now)),
+        ('types.geo_point.to_parse', geo_point.to_parse),
+        ('types.geo_point.to_python', lambda: GeoPoint.to_python(geo_point_dict)),
+    ]
+
+
+def strings_cases(stack):
+    return [
+        ('strings.camelcase', lambda: camelcase('installation_id_of_device')),
+        ('strings.snakecase', lambda: snakecase('installationIdOfDevice')),
+        ('strings.snakify', lambda: snakify('Installation Id Of Device')),
+    ]
+
+
+def request_cases(stack):
+    """End-to-end cost of requests: HTTP transports against a local stub server, and the client alone against the
+    in-memory fake server"""
+    stub_server = stack.enter_context(StubServer())
+    # noinspection PyProtectedMember
+    credentials = (pyparse._application_id, pyparse._rest_api_key, pyparse._master_key, pyparse._server_url)
+
+    def restore_credentials():
+        pyparse._application_id, pyparse._rest_api_key, pyparse._master_key, pyparse._server_url = credentials
+
+    stack.callback(restore_credentials)
+    pyparse.setup('benchmark', 'benchmark', server_url=stub_server.url)
+    stack.callback(pyparse.setup_transport, None)
+
+    fake_server = FakeParseServer()
+    fake_server.request('post', stub_server.url + '/classes/Narrow', data='{"name":"narrow","count":1}')
+    object_id = fake_server.objects('Narrow')[0]['objectId']
+
+    cases = []
+    for transport_name, transport in (('requests', SessionPool()), ('http_client', HTTPClientTransport())):
+        stack.callback(transport.close)
+        cases += [
+            ('request.{}.fetch'.format(transport_name), lambda: Narrow.fetch('o000000000'),
+             lambda transport=transport: pyparse.setup_transport(transport)),
+            ('request.{}.query_100'.format(transport_name), lambda: Narrow.query().fetch(),
+             lambda transport=transport: pyparse.setup_transport(transport)),
+        ]
+    cases += [
+        ('request.fake_server.fetch', lambda: Narrow.fetch(object_id),
+         lambda: pyparse.setup_transport(fake_server)),
+        ('request.fake_server.query', lambda: Narrow.query().fetch(),
+         lambda: pyparse.setup_transport(fake_server)),
+    ]
+
+    # Overhead of instrumentation. Hooks stay registered until the end of the group.
+    def enable_metrics():
+        pyparse.setup_transport(fake_server)
+        metrics.registry.enable()
+        stack.callback(metrics.registry.disable)
+
+    cases.append(('request.fake_server.query.metrics', lambda: Narrow.query().fetch(), enable_metrics))
+    return cases
+
+
+groups = [object_cases, query_cases, types_cases, strings_cases, request_cases]
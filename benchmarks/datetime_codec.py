@@ -0,0 +1,91 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compare the datetime codec of `pyparse.core.data.types` with the strptime/strftime based one it replaced.
+
+    python -m benchmarks.datetime_codec
+"""
+
+import datetime
+import timeit
+
+from pyparse.core.data.types import (UTC, datetime_str_to_python, datetime_strs_to_python, datetime_to_parse_str)
+
+
+# == Reference implementation (before the fast path) ===================================================================
+
+class _ReferenceLocalTimezone(datetime.tzinfo):
+
+    @staticmethod
+    def utcoffset(*args, **kwargs):
+        timedelta = datetime.datetime.now() - datetime.datetime.utcnow()
+        return datetime.timedelta(minutes=round(timedelta.total_seconds()/60))
+
+    @staticmethod
+    def dst(*args, **kwargs):
+        return datetime.timedelta(0)
+
+
+def reference_datetime_to_parse_str(datetime_obj):
+    if not datetime_obj.tzinfo:
+        datetime_obj = datetime_obj.replace(tzinfo=_ReferenceLocalTimezone())
+    return datetime_obj.astimezone(UTC()).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]+'Z'
+
+
+def reference_datetime_str_to_python(parse_str):
+    return datetime.datetime.strptime(parse_str, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=UTC())
+
+
+# == Benchmarks ========================================================================================================
+
+PARSE_STRS = ['2015-07-{:02d}T{:02d}:34:56.{:03d}Z'.format(day, day % 24, day * 7) for day in range(1, 29)]
+UTC_DATETIMES = [reference_datetime_str_to_python(parse_str) for parse_str in PARSE_STRS]
+NAIVE_DATETIMES = [datetime_obj.replace(tzinfo=None) for datetime_obj in UTC_DATETIMES]
+
+
+def benchmarks():
+    """
+    :return: name, reference function and current function of each benchmark. Each function converts a list of values.
+    :rtype: list[(str, collections.Callable, collections.Callable)]
+    """
+    return [
+        ('datetime_str_to_python',
+         lambda: [reference_datetime_str_to_python(s) for s in PARSE_STRS],
+         lambda: [datetime_str_to_python(s) for s in PARSE_STRS]),
+        ('datetime_strs_to_python (bulk)',
+         lambda: [reference_datetime_str_to_python(s) for s in PARSE_STRS],
+         lambda: datetime_strs_to_python(PARSE_STRS)),
+        ('datetime_to_parse_str (UTC)',
+         lambda: [reference_datetime_to_parse_str(d) for d in UTC_DATETIMES],
+         lambda: [datetime_to_parse_str(d) for d in UTC_DATETIMES]),
+        ('datetime_to_parse_str (naive)',
+         lambda: [reference_datetime_to_parse_str(d) for d in NAIVE_DATETIMES],
+         lambda: [datetime_to_parse_str(d) for d in NAIVE_DATETIMES]),
+    ]
+
+
+def main(repeat=5, number=2000):
+    for name, reference, current in benchmarks():
+        assert reference() == current(), '{} changed the output'.format(name)
+        reference_time = min(timeit.repeat(reference, repeat=repeat, number=number)) / number / len(PARSE_STRS)
+        current_time = min(timeit.repeat(current, repeat=repeat, number=number)) / number / len(PARSE_STRS)
+        print('{:<32} reference {:>7.2f} us  current {:>7.2f} us  speedup {:>5.2f}x'.format(
+            name, reference_time * 1e6, current_time * 1e6, reference_time / current_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Compare the number of objects constructed per second for a class with many fields against the per-instance setup of
+`increment_<field>` partials it replaced.
+
+    python -m benchmarks.instantiation
+"""
+
+from functools import partial
+import timeit
+
+from pyparse.core.data.fields import Field, NumberField
+from pyparse.core.data.object import Object
+
+_field_count = 40
+
+Wide = type('Wide', (Object,), dict(
+    [('text_{}'.format(i), Field()) for i in range(_field_count // 2)] +
+    [('number_{}'.format(i), NumberField()) for i in range(_field_count // 2)]
+))
+
+
+class _ReferenceWide(Wide):
+    """`Wide` with the per-instance setup done by `ObjectBase.__call__` before increment methods were generated"""
+
+    class_name = 'Wide'
+
+    def __init__(self, *args, **kwargs):
+        super(_ReferenceWide, self).__init__(*args, **kwargs)
+        for field_name, field in self._fields_python.items():
+            if isinstance(field, NumberField):
+                setattr(self, 'increment_{}'.format(field_name), partial(self.increment, field.parse_name))
+
+
+def _raw_parse_dict():
+    raw = {'objectId': 'a1b2c3', 'createdAt': '2015-07-03T04:05:06.789Z', 'updatedAt': '2015-07-03T04:05:06.789Z'}
+    for i in range(_field_count // 2):
+        raw[Wide._fields_python['text_{}'.format(i)].parse_name] = 'value {}'.format(i)
+        raw[Wide._fields_python['number_{}'.format(i)].parse_name] = i
+    return raw
+
+
+def benchmarks():
+    """
+    :return: name, reference statement and current statement of each benchmark
+    :rtype: list[(str, collections.Callable, collections.Callable)]
+    """
+    raw = _raw_parse_dict()
+    content = Wide._parse_dict_to_python_value_dict(raw)
+    return [
+        ('empty object', _ReferenceWide, Wide),
+        ('object from content', lambda: _ReferenceWide(content=content), lambda: Wide(content=content)),
+        ('object from parse', lambda: _ReferenceWide.from_parse(raw), lambda: Wide.from_parse(raw)),
+        ('object from parse (lazy)', lambda: _ReferenceWide.from_parse(raw, lazy=True),
+         lambda: Wide.from_parse(raw, lazy=True)),
+    ]
+
+
+def main(repeat=5, number=20000):
+    for name, reference, current in benchmarks():
+        reference_time = min(timeit.repeat(reference, repeat=repeat, number=number)) / number
+        current_time = min(timeit.repeat(current, repeat=repeat, number=number)) / number
+        print('{:<26} reference {:>9,.0f} objects/s  current {:>9,.0f} objects/s  speedup {:>5.2f}x'.format(
+            name, 1 / reference_time, 1 / current_time, reference_time / current_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Report the memory used per instance of an `Installation`-like class with the default layout and the compact one.
+
+    python -m benchmarks.memory
+"""
+
+import gc
+import tracemalloc
+
+from pyparse.core.data.installation import Installation
+
+
+class CompactInstallation(Installation):
+    class_name = '_Installation'
+    compact = True
+
+
+def _raw_parse_dict(i):
+    return {
+        'objectId': 'i{:09d}'.format(i),
+        'createdAt': '2015-07-03T04:05:06.789Z',
+        'updatedAt': '2015-07-03T04:05:06.789Z',
+        'badge': i % 10,
+        'channels': ['', 'news'],
+        'timeZone': 'Asia/Taipei',
+        'deviceType': 'ios',
+        'installationId': '{:032x}'.format(i),
+        'deviceToken': '{:064x}'.format(i),
+        'appName': 'Tickle',
+        'appVersion': '1.0',
+        'parseVersion': '1.7.5',
+        'appIdentifier': 'com.tickleapp.tickle',
+    }
+
+
+def bytes_per_instance(object_class, count=10000, lazy=False):
+    """
+    :return: bytes allocated per object kept alive, including its content but not the (shared) raw values
+    :rtype: float
+    """
+    raw_parse_dicts = [_raw_parse_dict(i) for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [object_class.from_parse(raw_parse_dict, lazy=lazy) for raw_parse_dict in raw_parse_dicts]
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(objects) == count
+    return (after - before - count * 8) / count  # not counting the list holding the objects
+
+
+def main(count=10000):
+    for lazy in (False, True):
+        default = bytes_per_instance(Installation, count=count, lazy=lazy)
+        compact = bytes_per_instance(CompactInstallation, count=count, lazy=lazy)
+        print('{:<24} default {:>6.0f} B/object  compact {:>6.0f} B/object  saved {:>4.0%}'.format(
+            'lazy decoding' if lazy else 'decoded', default, compact, 1 - compact / default))
+
+
+if __name__ == '__main__':
+    main()
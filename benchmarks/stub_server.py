@@ -0,0 +1,113 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+A local HTTP server answering Parse REST API requests with canned responses, used to measure the end-to-end overhead
+of requests without depending on the network or on Parse.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import socket
+import threading
+
+
+def _raw_object(i):
+    return {
+        'objectId': 'o{:09d}'.format(i),
+        'createdAt': '2015-07-03T04:05:06.789Z',
+        'updatedAt': '2015-07-03T04:05:06.789Z',
+        'name': 'object {}'.format(i),
+        'count': i,
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'  # Keep connections alive
+
+    page_size = 100
+
+    def setup(self):
+        super(_Handler, self).setup()
+        # Headers and body are written separately. Don't let Nagle's algorithm delay the body.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+
+    def _send(self, status_code, response_dict):
+        body = json.dumps(response_dict, separators=(',', ':')).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length) if length else b''
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0].strip('/').split('/')
+        if len(path) == 3:
+            self._send(200, {'results': [_raw_object(i) for i in range(self.page_size)]})
+        else:
+            self._send(200, _raw_object(0))
+
+    def do_POST(self):
+        self._read_body()
+        self._send(201, {'objectId': 'o000000000', 'createdAt': '2015-07-03T04:05:06.789Z'})
+
+    def do_PUT(self):
+        self._read_body()
+        self._send(200, {'updatedAt': '2015-07-03T04:05:06.789Z'})
+
+    def do_DELETE(self):
+        self._send(200, {})
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(object):
+    """
+    Serve in a background thread while used as a context manager.
+
+    >>> with StubServer() as server:
+    ...     server.url.startswith('http://127.0.0.1:')
+    True
+    """
+
+    def __init__(self):
+        self._server = None
+        """:type: ThreadingHTTPServer"""
+
+    @property
+    def url(self):
+        """
+        :return: URL of the server, including the mount path
+        :rtype: str
+        """
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}/1'.format(host, port)
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='pyparse-stub-server', daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,190 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Run the benchmark cases of `benchmarks.cases` and compare runs.
+
+    python -m benchmarks run -o before.json
+    python -m benchmarks run -o after.json -k request.
+    python -m benchmarks compare before.json after.json
+
+Results are JSON: seconds per call (min, median, mean and standard deviation over the repeats) of every case, and
+the environment of the run.
+"""
+
+import argparse
+from contextlib import ExitStack
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+from benchmarks import cases as benchmark_cases
+
+RESULTS_VERSION = 1
+
+
+def _environment():
+    """
+    :rtype: dict
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, universal_newlines=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'commit': commit,
+        'started_at': datetime.datetime.utcnow().isoformat() + 'Z',
+    }
+
+
+def measure(statement, repeat=5, min_time=0.2):
+    """Time `statement`, calling it enough times per repeat to take at least `min_time` seconds
+
+    >>> result = measure(lambda: None, repeat=3, min_time=0.01)
+    >>> sorted(result)
+    ['mean', 'median', 'min', 'number', 'repeat', 'stdev']
+
+    :type statement: collections.Callable
+    :type repeat: int
+    :type min_time: float
+    :return: seconds per call
+    :rtype: dict
+    """
+    timer = timeit.Timer(statement)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2 if number < 1000 else 10
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.mean(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run(keyword=None, repeat=5, min_time=0.2, groups=None, report=None):
+    """
+    :param keyword: only run cases whose name contains `keyword`
+    :type keyword: str | None
+    :type repeat: int
+    :type min_time: float
+    :param groups: functions returning cases. Defaults to the groups of `benchmarks.cases`.
+    :type groups: list[collections.Callable]
+    :param report: called with the name and result of each case when it's done
+    :type report: collections.Callable
+    :rtype: dict
+    """
+    results = {}
+    for group in groups or benchmark_cases.groups:
+        with ExitStack() as stack:
+            for name, statement, *setup in group(stack):
+                if keyword and keyword not in name:
+                    continue
+                if setup:
+                    setup[0]()
+                results[name] = measure(statement, repeat=repeat, min_time=min_time)
+                if report:
+                    report(name, results[name])
+    return {'version': RESULTS_VERSION, 'environment': _environment(), 'results': results}
+
+
+def compare(base, current, threshold=0.1):
+    """Compare the median of cases of two runs
+
+    >>> base = {'results': {'a': {'median': 1e-6}, 'b': {'median': 2e-6}, 'c': {'median': 1e-6}}}
+    >>> current = {'results': {'a': {'median': 1.5e-6}, 'b': {'median': 1e-6}, 'd': {'median': 1e-6}}}
+    >>> [(name, round(ratio, 2), verdict) for name, _, _, ratio, verdict in compare(base, current)]
+    [('a', 1.5, 'slower'), ('b', 0.5, 'faster')]
+
+    :param threshold: relative change of the median above which a case is reported slower or faster
+    :type threshold: float
+    :return: name, base median, current median, ratio and verdict ('slower', 'faster' or '') of cases in both runs
+    :rtype: list[(str, float, float, float, str)]
+    """
+    rows = []
+    for name, base_result in base['results'].items():
+        current_result = current['results'].get(name, None)
+        if current_result is None:
+            continue
+        ratio = current_result['median'] / base_result['median']
+        verdict = 'slower' if ratio > 1 + threshold else 'faster' if ratio < 1 / (1 + threshold) else ''
+        rows.append((name, base_result['median'], current_result['median'], ratio, verdict))
+    return rows
+
+
+def _format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return '{:.2f} {}'.format(seconds / scale, unit)
+    return '{:.1f} ns'.format(seconds / 1e-9)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='pyparse benchmark suite')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='run benchmarks and write results as JSON')
+    run_parser.add_argument('-o', '--output', help='file to write results to (default: stdout)')
+    run_parser.add_argument('-k', '--keyword', help='only run cases whose name contains KEYWORD')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--min-time', type=float, default=0.2, help='min seconds per repeat')
+
+    compare_parser = subparsers.add_parser('compare', help='compare the results of two runs')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='relative change reported as a regression (default: 0.1)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        rows = compare(base, current, threshold=args.threshold)
+        for name, base_median, current_median, ratio, verdict in rows:
+            print('{:<40} {:>12} {:>12} {:>7.2f}x  {}'.format(name, _format_time(base_median),
+                                                               _format_time(current_median), ratio, verdict))
+        # Fail when something got slower, so it can be used in CI
+        return 1 if any(verdict == 'slower' for *_, verdict in rows) else 0
+
+    if args.command is None:
+        args = parser.parse_args(['run'] + (argv if argv is not None else sys.argv[1:]))
+
+    def report(name, result):
+        print('{:<40} {:>12}'.format(name, _format_time(result['median'])), file=sys.stderr)
+
+    results = run(keyword=args.keyword, repeat=args.repeat, min_time=args.min_time, report=report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+    return 0
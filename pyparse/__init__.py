@@ -15,7 +15,12 @@
 #
 
 import os
+import threading
 
+from pyparse.retry import RetryPolicy
+from pyparse.scheduler import RequestScheduler
+from pyparse.slow_query_log import SlowQueryLog
+from pyparse.transport import Transport, SessionPool, AsyncSessionPool
 from pyparse.utils.lang import SingletonBase
 
 
@@ -28,6 +33,21 @@ class ParsePy(object, metaclass=SingletonBase):
         """:type: str"""
         self._master_key = None
         """:type: str"""
+        self._server_url = None
+        """:type: str"""
+        self._transport = None
+        """:type: Transport"""
+        self._session_pool = None
+        """:type: SessionPool"""
+        self._session_pool_lock = threading.Lock()
+        self._async_session_pool = None
+        """:type: AsyncSessionPool"""
+        self.retry_policy = RetryPolicy()
+        """:type: RetryPolicy"""
+        self.scheduler = None
+        """:type: RequestScheduler | None"""
+        self.slow_query_log = None
+        """:type: SlowQueryLog | None"""
 
     @property
     def application_id(self):
@@ -71,7 +91,16 @@ class ParsePy(object, metaclass=SingletonBase):
         """
         return self._master_key or os.environ.get('PARSE_MASTER_KEY', None)
 
-    def setup(self, application_id=None, rest_api_key=None, master_key=None):
+    @property
+    def server_url(self):
+        """Get the URL of the Parse server (with the mount path, e.g. `https://example.com/parse`), or None to use
+        api.parse.com
+
+        :rtype: str | None
+        """
+        return self._server_url or os.environ.get('PARSE_SERVER_URL', None)
+
+    def setup(self, application_id=None, rest_api_key=None, master_key=None, server_url=None):
         """Setup PyParse with specified application id and rest api key
 
         >>> from pyparse import pyparse
@@ -99,12 +128,185 @@ class ParsePy(object, metaclass=SingletonBase):
         :type rest_api_key: str
         :param master_key: the master key to be used
         :type master_key: str
+        :param server_url: URL of a self-hosted Parse server, including its mount path
+        :type server_url: str
         """
         assert application_id, 'application id should not be empty'
         assert rest_api_key, 'rest api key should not be empty'
         self._application_id = application_id
         self._rest_api_key = rest_api_key
         self._master_key = master_key
+        self._server_url = server_url.rstrip('/') if server_url else None
+
+    def setup_retry_policy(self, **kwargs):
+        """Configure how failed requests are retried. Arguments are the same as `RetryPolicy`.
+
+        >>> from pyparse import pyparse
+        >>> pyparse.setup_retry_policy(max_retries={'put': 2})
+        >>> pyparse.retry_policy.retries('put')
+        2
+        >>> pyparse.setup_retry_policy()
+        """
+        self.retry_policy = RetryPolicy(**kwargs)
+
+    def setup_scheduler(self, rate, burst=None, weights=None):
+        """Limit the rate of requests to Parse sent by this process. Arguments are the same as `RequestScheduler`.
+        Pass None as `rate` to remove the limit.
+
+        >>> from pyparse import pyparse
+        >>> pyparse.setup_scheduler(rate=30)
+        >>> pyparse.scheduler.stats['bulk']['queue_depth']
+        0
+        >>> pyparse.setup_scheduler(None)
+
+        :type rate: float | None
+        :type burst: float
+        :type weights: dict[str, float]
+        """
+        self.scheduler = RequestScheduler(rate, burst=burst, weights=weights) if rate else None
+
+    def setup_slow_query_log(self, threshold, capacity=100, sample_rate=1.0, sink=None):
+        """Record queries (`Query.fetch`, `Query.count` and `Object.fetch`) slower than `threshold` seconds. Arguments
+        are the same as `SlowQueryLog`. Pass None as `threshold` to stop recording.
+
+        >>> from pyparse import pyparse
+        >>> pyparse.setup_slow_query_log(0.5, capacity=10)
+        >>> pyparse.slow_query_log.records()
+        []
+        >>> pyparse.setup_slow_query_log(None)
+
+        :type threshold: float | None
+        :type capacity: int
+        :type sample_rate: float
+        :type sink: str | io.TextIOBase | None
+        """
+        if self.slow_query_log:
+            self.slow_query_log.disable()
+        self.slow_query_log = SlowQueryLog(threshold, capacity=capacity, sample_rate=sample_rate, sink=sink) \
+            if threshold is not None else None
+        if self.slow_query_log:
+            self.slow_query_log.enable()
+
+    @property
+    def transport(self):
+        """Get the transport used to send requests to Parse REST API. Defaults to `session_pool`.
+
+        :rtype: Transport
+        """
+        return self._transport or self.session_pool
+
+    @property
+    def async_transport(self):
+        """Get the transport used by the asyncio API. Defaults to `async_session_pool`.
+
+        :rtype: Transport
+        """
+        return self._transport or self.async_session_pool
+
+    def setup_transport(self, transport):
+        """Send requests to Parse REST API with `transport`, e.g. an `HTTPClientTransport` of `pyparse.transport` or a
+        `FakeParseServer` of `pyparse.fake_server`. It's used by the asyncio API too.
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.transport import HTTPClientTransport
+        >>> pyparse.setup_transport(HTTPClientTransport())
+        >>> type(pyparse.transport).__name__
+        'HTTPClientTransport'
+        >>> pyparse.setup_transport(None)
+        >>> type(pyparse.transport).__name__
+        'SessionPool'
+
+        :param transport: the transport, or None to use the pooled `requests` sessions again
+        :type transport: Transport | None
+        """
+        previous_transport, self._transport = self._transport, transport
+        if previous_transport and previous_transport is not transport:
+            previous_transport.close()
+
+    @property
+    def session_pool(self):
+        """Get the pool of HTTP sessions shared by all requests to Parse REST API
+
+        A default pool is created on first use if `setup_session_pool` hasn't been called.
+
+        :rtype: SessionPool
+        """
+        if self._session_pool is None:
+            with self._session_pool_lock:
+                if self._session_pool is None:
+                    self._session_pool = SessionPool()
+        return self._session_pool
+
+    def setup_session_pool(self, pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True):
+        """Configure the pool of HTTP sessions used to call Parse REST API. The previous pool, if any, is closed.
+
+        >>> from pyparse import pyparse
+        >>> pyparse.setup_session_pool(pool_maxsize=32)
+        >>> pyparse.session_pool._pool_maxsize
+        32
+        >>> pyparse.close()
+
+        :param pool_connections: number of per-host connection pools to cache
+        :type pool_connections: int
+        :param pool_maxsize: maximum number of connections kept alive per host
+        :type pool_maxsize: int
+        :param pool_block: block when all connections of a host are in use instead of opening a throwaway one
+        :type pool_block: bool
+        :param keep_alive: keep connections open after a response has been read
+        :type keep_alive: bool
+        """
+        session_pool = SessionPool(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                   pool_block=pool_block, keep_alive=keep_alive)
+        with self._session_pool_lock:
+            previous_session_pool, self._session_pool = self._session_pool, session_pool
+        if previous_session_pool:
+            previous_session_pool.close()
+
+    def close(self):
+        """Close all pooled connections to Parse REST API"""
+        with self._session_pool_lock:
+            session_pool, self._session_pool = self._session_pool, None
+        if session_pool:
+            session_pool.close()
+        if self._transport:
+            self._transport.close()
+
+    @property
+    def async_session_pool(self):
+        """Get the pool of aiohttp sessions shared by all asyncio requests to Parse REST API
+
+        A default pool is created on first use if `setup_async_session_pool` hasn't been called.
+
+        :rtype: AsyncSessionPool
+        """
+        if self._async_session_pool is None:
+            with self._session_pool_lock:
+                if self._async_session_pool is None:
+                    self._async_session_pool = AsyncSessionPool()
+        return self._async_session_pool
+
+    def setup_async_session_pool(self, limit=100, limit_per_host=0, max_concurrency=100, keep_alive=True):
+        """Configure the pool of aiohttp sessions used by the asyncio API. Requires `aiohttp`.
+
+        Sessions of the previous pool are not closed. Await `aclose` before calling this if needed.
+
+        :param limit: maximum number of open connections
+        :type limit: int
+        :param limit_per_host: maximum number of open connections per host (0 means no limit)
+        :type limit_per_host: int
+        :param max_concurrency: maximum number of requests in flight
+        :type max_concurrency: int
+        :param keep_alive: keep connections open after a response has been read
+        :type keep_alive: bool
+        """
+        self._async_session_pool = AsyncSessionPool(limit=limit, limit_per_host=limit_per_host,
+                                                    max_concurrency=max_concurrency, keep_alive=keep_alive)
+
+    async def aclose(self):
+        """Close the aiohttp session of the running event loop. `asyncio.run` closes it by itself, so it's only needed
+        for a loop closed without `loop.shutdown_asyncgens()`."""
+        if self._async_session_pool:
+            await self._async_session_pool.aclose()
 
 
 pyparse = ParsePy()
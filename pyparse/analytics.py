@@ -14,19 +14,205 @@
 # limitations under the License.
 #
 
-from pyparse.core.data.types import datetime_to_parse_dict
+import atexit
+import datetime
+import queue
+import threading
+import time
+
+from pyparse.core.data.types import UTC, datetime_to_parse_dict
 from pyparse.request import request_parse
 from pyparse.utils.strings import snakify
 
 
+class AnalyticsPipeline(object):
+    """
+    Send events in the background. Events are put into a bounded queue and POSTed concurrently by worker threads
+    (Parse has no batch endpoint for events).
+
+    With the `drop` policy, events which don't fit in the queue are counted and dropped instead of blocking:
+
+    >>> from pyparse import pyparse
+    >>> from pyparse.fake_server import FakeParseServer
+    >>> class SlowServer(FakeParseServer):
+    ...     def __init__(self):
+    ...         super(SlowServer, self).__init__()
+    ...         self.sending, self.resume = threading.Event(), threading.Event()
+    ...     def request(self, verb, url, **kwargs):
+    ...         self.sending.set()
+    ...         self.resume.wait()
+    ...         return super(SlowServer, self).request(verb, url, **kwargs)
+    >>> pyparse.setup_transport(SlowServer())
+    >>> pipeline = AnalyticsPipeline(max_queue_size=1, policy=AnalyticsPipeline.DROP, workers=1, flush_on_exit=False)
+    >>> pipeline.enqueue('events/first', {}), pyparse.transport.sending.wait(5)
+    (True, True)
+    >>> pipeline.enqueue('events/second', {}), pipeline.enqueue('events/third', {}), pipeline.dropped
+    (True, False, 1)
+    >>> pipeline.close(timeout=0.1)  # returns even though the queue is full
+    >>> pyparse.transport.resume.set()
+    >>> pipeline.flush(timeout=5), [name for name, _ in pyparse.transport.events]
+    (True, ['first', 'second'])
+    >>> pyparse.setup_transport(None)
+    """
+
+    BLOCK = 'block'
+    DROP = 'drop'
+
+    def __init__(self, max_queue_size=10000, policy=BLOCK, workers=4, flush_on_exit=True, on_error=None):
+        """
+        :param max_queue_size: max number of events waiting to be sent
+        :type max_queue_size: int
+        :param policy: what to do when the queue is full: `block` the caller until there's room, or `drop` the event
+        :type policy: str
+        :param workers: number of events sent concurrently
+        :type workers: int
+        :param flush_on_exit: send queued events when the interpreter exits
+        :type flush_on_exit: bool
+        :param on_error: called with the event path, arguments and the exception when an event failed to be sent
+        :type on_error: collections.Callable
+        """
+        assert policy in (self.BLOCK, self.DROP), 'policy only accepts block and drop'
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._policy = policy
+        """:type: str"""
+        self._on_error = on_error
+
+        self.dropped = 0
+        """:type: int"""
+        self.failed = 0
+        """:type: int"""
+        self._counters_lock = threading.Lock()
+        self._closed = False
+
+        self._workers = [threading.Thread(target=self._work, name='pyparse-analytics-{}'.format(i), daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+        if flush_on_exit:
+            atexit.register(self.flush)
+
+    def enqueue(self, path, arguments):
+        """
+        :type path: str
+        :type arguments: dict
+        :return: False if the event was dropped because the queue is full
+        :rtype: bool
+        """
+        try:
+            if self._closed:
+                raise queue.Full()
+            self._queue.put((path, arguments), block=self._policy == self.BLOCK)
+        except queue.Full:
+            with self._counters_lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def _work(self):
+        while True:
+            event = self._queue.get()
+            try:
+                if event is None:
+                    return
+                path, arguments = event
+                try:
+                    request_parse('post', path, arguments=arguments)
+                except Exception as e:
+                    with self._counters_lock:
+                        self.failed += 1
+                    if self._on_error:
+                        self._on_error(path, arguments, e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout=None):
+        """Wait until all queued events are sent
+
+        :param timeout: max seconds to wait, or None to wait until done
+        :type timeout: float | None
+        :return: True if all events are sent
+        :rtype: bool
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        """Send queued events and stop workers. Events still queued after `timeout` are sent by the workers before they
+        stop, and events enqueued afterwards are dropped.
+
+        :param timeout: max seconds to wait for queued events, or None to wait until done
+        :type timeout: float | None
+        """
+        self._closed = True
+        self.flush(timeout=timeout)
+        atexit.unregister(self.flush)
+        threading.Thread(target=self._stop_workers, name='pyparse-analytics-close', daemon=True).start()
+
+    def _stop_workers(self):
+        # Blocks until there's room in the queue for each sentinel, so it doesn't run in the caller of `close`
+        for _ in self._workers:
+            self._queue.put(None)
+
+
 class Analytics(object):
 
-    @staticmethod
-    def track(event, at=None, **dimensions):
+    _pipeline = None
+    """:type: AnalyticsPipeline"""
+
+    @classmethod
+    def enable_buffering(cls, **kwargs):
+        """Send events in the background with an `AnalyticsPipeline` built with `kwargs`. `track` doesn't wait anymore.
+
+        :rtype: AnalyticsPipeline
         """
+        cls.disable_buffering()
+        cls._pipeline = AnalyticsPipeline(**kwargs)
+        return cls._pipeline
+
+    @classmethod
+    def disable_buffering(cls, timeout=None):
+        """Send queued events and go back to sending events synchronously
+
+        :type timeout: float | None
+        """
+        pipeline, cls._pipeline = cls._pipeline, None
+        if pipeline:
+            pipeline.close(timeout=timeout)
+
+    @classmethod
+    def flush(cls, timeout=None):
+        """Wait until all queued events are sent
+
+        :type timeout: float | None
+        :rtype: bool
+        """
+        return cls._pipeline.flush(timeout=timeout) if cls._pipeline else True
+
+    @classmethod
+    def track(cls, event, at=None, **dimensions):
+        """
+        >>> from pyparse import pyparse
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> _ = Analytics.enable_buffering(workers=1)
+        >>> Analytics.track('Search', category='news')
+        >>> Analytics.disable_buffering()
+        >>> name, body = pyparse.transport.events[0]
+        >>> name, body['dimensions'], body['at']['__type']
+        ('search', {'category': 'news'}, 'Date')
+        >>> pyparse.setup_transport(None)
+
         :param event:
         :type event: str
-        :param at:
+        :param at: when the event happened. Defaults to now: when buffering, it's set when the event is queued.
         :type at: datetime.datetime
         :param dimensions:
         :type dimensions: dict[str, object]
@@ -43,7 +229,14 @@ class Analytics(object):
         if at:
             arguments['at'] = datetime_to_parse_dict(at)
 
-        return request_parse('post', 'events/{}'.format(event), arguments=arguments)
+        path = 'events/{}'.format(event)
+        if cls._pipeline:
+            if not at:
+                # Parse would stamp the event when it's sent
+                arguments['at'] = datetime_to_parse_dict(datetime.datetime.now(UTC()))
+            cls._pipeline.enqueue(path, arguments)
+            return None
+        return request_parse('post', path, arguments=arguments)
 
     @classmethod
     def app_opened(cls, at=None):
@@ -15,21 +15,132 @@
 #
 
 from copy import deepcopy
+import threading
+import time
 
 from pyparse.request import request_parse
 from pyparse.utils.lang import SingletonBase
 
 
 class Config(object, metaclass=SingletonBase):
+    """
+    >>> import time
+    >>> from pyparse import pyparse
+    >>> from pyparse.fake_server import FakeParseServer
+    >>> pyparse.setup_transport(FakeParseServer(latency=0.1))
+    >>> pyparse.transport.config['greeting'] = 'hello'
+    >>> Config.ttl = 0
+    >>> config = Config()
+    >>> pyparse.transport.config['greeting'] = 'hi'
+    >>> config['greeting']  # Stale: reloaded in the background
+    'hello'
+    >>> while config._refreshing:
+    ...     time.sleep(0.01)
+    >>> Config.ttl = None
+    >>> config['greeting']
+    'hi'
+    >>> pyparse.setup_transport(None)
+    """
+
+    ttl = None
+    """Seconds before the config is considered stale and reloaded in the background on the next read. None means the
+    config is only reloaded by calling `fetch`. `Config` is a singleton, so this is set on the class, e.g.
+    `Config.ttl = 60`.
+
+    :type: float | None"""
 
     def __init__(self):
         super(Config, self).__init__()
         self._content = {}
+        # The error raised by the last background refresh, or None if it succeeded
+        self.last_error = None
+        """:type: Exception | None"""
+
+        self._fetched_at = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._listeners = {}
+        """:type: dict[str, list[collections.Callable]]"""
 
         self.fetch()
 
     def fetch(self):
-        self._content.update(request_parse('get', 'config')['params'])
+        content = request_parse('get', 'config')['params']
+        with self._lock:
+            previous_content, self._content = self._content, content
+            self._fetched_at = time.monotonic()
+        self._notify_listeners(previous_content, content)
+
+    # Refresh
+
+    @property
+    def stale(self):
+        """:type: bool"""
+        return self.ttl is not None and time.monotonic() - self._fetched_at >= self.ttl
+
+    def _refresh_if_stale(self):
+        """Start reloading the config in the background if it's stale. Current values are served meanwhile."""
+        if self._refreshing or not self.stale:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name='pyparse-config-refresh', daemon=True).start()
+
+    def _refresh(self):
+        try:
+            self.fetch()
+        except Exception as e:
+            # Keep serving the last good values, and retry after another ttl
+            self.last_error = e
+            self._fetched_at = time.monotonic()
+        else:
+            self.last_error = None
+        finally:
+            self._refreshing = False
+
+    @property
+    def _fresh_content(self):
+        """
+        :rtype: dict
+        """
+        self._refresh_if_stale()
+        return self._content
+
+    # Change notifications
+
+    def add_listener(self, key, callback):
+        """Call `callback(key, old_value, new_value)` when the value of `key` is changed by a reload
+
+        :type key: str
+        :type callback: collections.Callable
+        """
+        with self._lock:
+            self._listeners.setdefault(key, []).append(callback)
+
+    def remove_listener(self, key, callback):
+        """
+        :type key: str
+        :type callback: collections.Callable
+        """
+        with self._lock:
+            self._listeners.get(key, []).remove(callback)
+
+    def _notify_listeners(self, previous_content, content):
+        """
+        :type previous_content: dict
+        :type content: dict
+        """
+        with self._lock:
+            listeners = [(key, list(callbacks)) for key, callbacks in self._listeners.items() if callbacks]
+        for key, callbacks in listeners:
+            old_value, new_value = previous_content.get(key, None), content.get(key, None)
+            if old_value != new_value:
+                for callback in callbacks:
+                    callback(key, old_value, new_value)
+
+    # Content
 
     def __repr__(self):
         return repr(self._content)
@@ -38,29 +149,29 @@ class Config(object, metaclass=SingletonBase):
         return repr(self)
 
     def __getitem__(self, key):
-        return self._content.get(key, None)
+        return self._fresh_content.get(key, None)
 
     def __contains__(self, key):
-        return key in self._content
+        return key in self._fresh_content
 
     def __iter__(self):
         """
         :rtype: collections.Iterable[str]
         """
-        return self._content.__iter__()
+        return self._fresh_content.__iter__()
 
     def items(self):
         """
         :rtype: collections.Iterable[(str, object)]
         """
-        return self._content.items()
+        return self._fresh_content.items()
 
     def values(self):
         """
         :rtype: collections.Iterable[object]
         """
-        return self._content.values()
+        return self._fresh_content.values()
 
     @property
     def as_dict(self):
-        return deepcopy(self._content)
+        return deepcopy(self._fresh_content)
@@ -14,15 +14,121 @@
 # limitations under the License.
 #
 
-from functools import partial
 import os
 
-from pyparse.core.data.fields import Field, NumberField
+from pyparse.core.data.compact import CompactObjectMixin, compact_content_class
+from pyparse.core.data.fields import Field, ListField, NumberField
 from pyparse.utils.strings import camelcase
 
 _parse_object__module__ = __package__ + '.' + os.path.splitext('object.py')[0]
 
 
+class FieldDescriptor(object):
+    """
+    Attribute of an `Object` class which reads/writes the value of a field (by its parse name) of its instances
+    """
+
+    __slots__ = ('field', 'parse_name')
+
+    def __init__(self, field):
+        """
+        :type field: Field
+        """
+        self.field = field
+        """:type: Field"""
+        self.parse_name = field.parse_name
+        """:type: str"""
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.get(self.parse_name)
+
+    def __set__(self, instance, value):
+        if self.field.readonly:
+            raise AttributeError('{} is a readonly field.'.format(self.field.python_name))
+        instance.set(self.parse_name, value)
+
+
+def _increment_method(field):
+    """Create the `increment_<field>` method of a `NumberField`
+
+    >>> from pyparse import pyparse
+    >>> from pyparse.core import Object
+    >>> from pyparse.fake_server import FakeParseServer
+    >>> class Counter(Object):
+    ...     hits = NumberField()
+    ...     misses = NumberField()
+    ...     def increment_misses(self, step=1, defer=None):
+    ...         return self.increment('misses', -step, defer=defer)
+    >>> pyparse.setup_transport(FakeParseServer())
+    >>> counter = Counter(hits=0, misses=0)
+    >>> counter.increment_hits()
+    >>> counter.save()
+    >>> counter.increment_hits(2)
+    >>> counter.increment_misses()
+    >>> counter.hits, counter.misses, pyparse.transport.objects('Counter')[0]['hits']
+    (3, -1, 3)
+    >>> 'increment_hits' in vars(Counter), 'increment_hits' in vars(counter)
+    (True, False)
+    >>> class RetriedCounter(Counter):
+    ...     retries = NumberField()
+    >>> counter = RetriedCounter(misses=0, retries=0)
+    >>> counter.increment_misses()
+    >>> counter.increment_retries()
+    >>> counter.misses, counter.retries, 'increment_misses' in vars(RetriedCounter)
+    (-1, 1, False)
+    >>> pyparse.setup_transport(None)
+
+    :type field: NumberField
+    :rtype: collections.Callable
+    """
+    parse_name = field.parse_name
+
+    def increment(self, step=1, defer=None):
+        return self.increment(parse_name, step, defer=defer)
+
+    increment.__name__ = 'increment_{}'.format(field.python_name)
+    increment.__doc__ = 'Increment `{}` by `step`'.format(field.python_name)
+    return increment
+
+
+def _list_operation_method(field, operation_name, method_name):
+    """Create a method applying an array operation (e.g. `Object.add`) to a `ListField`, e.g. `add_to_<field>`
+
+    >>> from pyparse.core import Object
+    >>> class Post(Object):
+    ...     tags = ListField()
+    ...     def add_to_tags(self, *tags):
+    ...         return self.add_unique('tags', *(tag.lower() for tag in tags))
+    >>> class Photo(Post):
+    ...     albums = ListField()
+    >>> photo = Photo(tags=['sky'], albums=[])
+    >>> photo.add_to_tags('Sky', 'Sea')
+    >>> photo.add_to_albums('2015')
+    >>> photo.remove_from_tags('sky')
+    >>> photo.tags, photo.albums, 'add_to_tags' in vars(Photo)
+    (['sea'], ['2015'], False)
+
+    :type field: ListField
+    :type operation_name: str
+    :type method_name: str
+    :rtype: collections.Callable
+    """
+    parse_name = field.parse_name
+
+    def operate(self, *objects):
+        return getattr(self, operation_name)(parse_name, *objects)
+
+    operate.__name__ = method_name
+    operate.__doc__ = '`{}` objects to `{}`'.format(operation_name, field.python_name)
+    return operate
+
+
+# Methods generated for each `ListField`, by name format and the `Object` method they call
+_list_operation_methods = (('add_to_{}', 'add'), ('add_unique_to_{}', 'add_unique'), ('remove_from_{}', 'remove'))
+
+
 class ObjectBase(type):
 
     anonymous_classes = {}
@@ -62,27 +168,42 @@ class ObjectBase(type):
         final_class_dict['class_name'] = final_class_dict.get('class_name', class_name)
         final_class_dict['is_anonymous_class'] = False
 
-        # Add fields back as value property
+        # Setup compact storage
+        if 'compact' in class_dict:
+            compact = class_dict['compact']
+        else:
+            compact = any(getattr(base, 'compact', False) for base in bases)
+        if compact and '__slots__' not in class_dict:
+            if any(issubclass(base, CompactObjectMixin) for base in bases):
+                final_class_dict['__slots__'] = ()
+            else:
+                bases = (CompactObjectMixin,) + bases
+                final_class_dict['__slots__'] = CompactObjectMixin._slots
+            parse_names = [field.parse_name for field in final_class_dict['_fields_python'].values()]
+            final_class_dict['_content_class'] = compact_content_class(final_class_dict['class_name'], parse_names)
+
+        # Add fields back as descriptors
         for field_name, field in fields_python.items():
-            final_class_dict[field_name] = property(
-                fget=mcs._getter(field),
-                fset=mcs._setter(field) if not field.readonly else None
-            )
+            final_class_dict[field_name] = FieldDescriptor(field)
+
+        # Setup incrementable fields (methods defined by the class or inherited win)
+        for field_name, field in final_class_dict['_fields_python'].items():
+            method_name = 'increment_{}'.format(field_name)
+            if isinstance(field, NumberField) and method_name not in class_dict and \
+                    not any(hasattr(base, method_name) for base in bases):
+                final_class_dict[method_name] = _increment_method(field)
+
+        # Setup array operations of list fields (methods defined by the class or inherited win)
+        for field_name, field in final_class_dict['_fields_python'].items():
+            if isinstance(field, ListField):
+                for method_name_format, operation_name in _list_operation_methods:
+                    method_name = method_name_format.format(field_name)
+                    if method_name not in class_dict and not any(hasattr(base, method_name) for base in bases):
+                        final_class_dict[method_name] = _list_operation_method(field, operation_name, method_name)
+
         # Create class
         return type.__new__(mcs, class_name, bases, final_class_dict)
 
-    @staticmethod
-    def _getter(field):
-        def getter(self):
-            return self.get(field.parse_name)
-        return getter
-
-    @staticmethod
-    def _setter(field):
-        def setter(self, value):
-            return self.set(field.parse_name, value)
-        return setter
-
     @classmethod
     def anonymous_class(mcs, class_name):
         klass = mcs.anonymous_classes.get(class_name, None)
@@ -95,15 +216,7 @@ class ObjectBase(type):
         return klass
 
     def __call__(cls, *args, class_name=None, **kwargs):
-        klass = super(ObjectBase, cls if not class_name else cls.anonymous_class(class_name)).__call__(*args, **kwargs)
-
-        # noinspection PyProtectedMember
-        fields = klass._fields_python
-        """:type: dict[str, Field]"""
-
-        # Setup incrementable fields
-        for field_name, field in fields.items():
-            if isinstance(field, NumberField):
-                setattr(klass, 'increment_{}'.format(field_name), partial(klass.increment, field.parse_name))
-
-        return klass
+        # Everything per class is set up by `__new__`, so creating an object is a plain `type.__call__`
+        if class_name:
+            cls = cls.anonymous_class(class_name)
+        return type.__call__(cls, *args, **kwargs)
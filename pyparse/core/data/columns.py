@@ -0,0 +1,187 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import datetime
+
+from pyparse.core.data.fields import AutoDateTimeField, DateTimeField, GeoPointField, NumberField
+from pyparse.core.data.types import ParseConvertible, UTC
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_epoch = datetime.datetime(1970, 1, 1, tzinfo=UTC())
+_millisecond = datetime.timedelta(milliseconds=1)
+
+
+def _number_column(converter, values):
+    """
+    :rtype: numpy.ndarray
+    """
+    return numpy.fromiter((numpy.nan if value is None else converter(value) for value in values),
+                          dtype=numpy.float64, count=len(values))
+
+
+def _datetime_column(converter, values):
+    """
+    :rtype: numpy.ndarray
+    """
+    nat = numpy.iinfo(numpy.int64).min
+    return numpy.fromiter((nat if value is None else (converter(value) - _epoch) // _millisecond for value in values),
+                          dtype=numpy.int64, count=len(values)).view('datetime64[ms]')
+
+
+def _geo_point_column(converter, values):
+    """
+    :return: an array of shape (n, 2) of latitudes and longitudes
+    :rtype: numpy.ndarray
+    """
+    column = numpy.full((len(values), 2), numpy.nan)
+    for i, value in enumerate(values):
+        if value is not None:
+            geo_point = converter(value)
+            column[i] = (geo_point.latitude, geo_point.longitude)
+    return column
+
+
+def _object_column(converter, values):
+    """
+    :rtype: numpy.ndarray
+    """
+    column = numpy.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        if value is not None:
+            column[i] = converter(value)
+    return column
+
+
+def _column_builder(field):
+    """
+    :type field: pyparse.core.data.fields.Field | None
+    :return: function building the column of a page from the converter of `field` and the raw values of the page
+    :rtype: collections.Callable
+    """
+    if isinstance(field, NumberField):
+        return _number_column
+    elif isinstance(field, (DateTimeField, AutoDateTimeField)):
+        return _datetime_column
+    elif isinstance(field, GeoPointField):
+        return _geo_point_column
+    return _object_column
+
+
+class Columns(object):
+    """
+    Columnar result of a query, created by `Query.to_columns`. Each requested field is one NumPy array:
+
+    - `NumberField`s are float64 arrays, with NaN for missing values.
+    - `DateTimeField`s, `createdAt` and `updatedAt` are datetime64[ms] arrays (in UTC), with NaT for missing values.
+    - `GeoPointField`s are float64 arrays of shape (n, 2) holding latitude and longitude, with NaN for missing values.
+    - Other fields are object arrays of python values, with None for missing values.
+
+    `masks[name]` is a bool array which is True where the object has no value for the field.
+
+    Requires `numpy` (`pip install pyparse[columns]`).
+    """
+
+    def __init__(self, arrays, masks):
+        """
+        :type arrays: dict[str, numpy.ndarray]
+        :type masks: dict[str, numpy.ndarray]
+        """
+        self._arrays = arrays
+        """:type: dict[str, numpy.ndarray]"""
+        self.masks = masks
+        """:type: dict[str, numpy.ndarray]"""
+
+    @classmethod
+    def from_pages(cls, object_class, fields, pages):
+        """Build columns page by page from raw query results, without creating any `Object`
+
+        :type object_class: pyparse.core.data.base.ObjectBase
+        :param fields: python or parse names of the fields of the columns
+        :type fields: list[str]
+        :param pages: lists of objects in Parse's representation
+        :type pages: collections.Iterable[list[dict]]
+        :rtype: Columns
+        """
+        if numpy is None:
+            raise ImportError('numpy is required to get the result of a query as columns')
+
+        # noinspection PyProtectedMember
+        fields_python, fields_parse = object_class._fields_python, object_class._fields_parse
+        specs = []
+        for name in fields:
+            field = fields_python.get(name, None) or fields_parse.get(name, None)
+            if field:
+                specs.append((name, field.parse_name, _column_builder(field), field.to_python))
+            else:
+                specs.append((name, name, _object_column, ParseConvertible.guess_to_python))
+
+        chunks = {name: [] for name in fields}
+        mask_chunks = {name: [] for name in fields}
+        for page in pages:
+            for name, parse_name, build, converter in specs:
+                values = [content.get(parse_name, None) for content in page]
+                chunks[name].append(build(converter, values))
+                mask_chunks[name].append(numpy.fromiter((value is None for value in values), dtype=bool,
+                                                        count=len(values)))
+
+        arrays, masks = {}, {}
+        for name, parse_name, build, converter in specs:
+            arrays[name] = numpy.concatenate(chunks[name]) if chunks[name] else build(converter, [])
+            masks[name] = numpy.concatenate(mask_chunks[name]) if mask_chunks[name] else numpy.zeros(0, dtype=bool)
+        return cls(arrays, masks)
+
+    def __len__(self):
+        """
+        :return: number of rows
+        :rtype: int
+        """
+        return len(next(iter(self.masks.values()))) if self.masks else 0
+
+    def __getitem__(self, name):
+        """
+        :rtype: numpy.ndarray
+        """
+        return self._arrays[name]
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+    def __iter__(self):
+        """
+        :rtype: collections.Iterator[str]
+        """
+        return iter(self._arrays)
+
+    def keys(self):
+        return self._arrays.keys()
+
+    def items(self):
+        return self._arrays.items()
+
+    def masked(self, name):
+        """
+        :return: the column of `name` as a masked array, which skips missing values in reductions like `mean`
+        :rtype: numpy.ma.MaskedArray
+        """
+        mask = self.masks[name]
+        array = self._arrays[name]
+        if array.ndim == 2:
+            mask = numpy.repeat(mask[:, numpy.newaxis], array.shape[1], axis=1)
+        return numpy.ma.MaskedArray(array, mask=mask)
@@ -0,0 +1,228 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+
+
+class CompactContent(object):
+    """
+    Base of the content records of compact `Object` classes. A record is a dict-like object (keyed by parse names)
+    storing the value of each declared field in a slot. Undeclared keys go into an overflow dict, which is only created
+    when there's one.
+
+    >>> Content = compact_content_class('City', ['objectId', 'name'])
+    >>> content = Content({'name': 'Taipei', 'population': 2700000})
+    >>> content
+    {'name': 'Taipei', 'population': 2700000}
+    >>> 'objectId' in content, content.get('objectId'), len(content)
+    (False, None, 2)
+    >>> del content['population']
+    >>> content._extra is None
+    True
+    """
+
+    __slots__ = ('_extra',)
+
+    _slot_names = {}
+    """Slot name of each declared key
+
+    :type: dict[str, str]"""
+    _bits = {}
+    """Bit of each key in dirty bitmasks. Undeclared keys get one the first time they're changed.
+
+    :type: dict[str, int]"""
+    _bits_lock = None
+
+    def __init__(self, content=()):
+        """
+        :type content: collections.Mapping | collections.Iterable[(str, object)]
+        """
+        self._extra = None
+        """:type: dict | None"""
+        for key, value in (content.items() if hasattr(content, 'items') else content):
+            self[key] = value
+
+    @classmethod
+    def bit(cls, key):
+        """
+        :type key: str
+        :rtype: int
+        """
+        bit = cls._bits.get(key, None)
+        if bit is None:
+            with cls._bits_lock:
+                bit = cls._bits.setdefault(key, len(cls._bits))
+        return bit
+
+    @classmethod
+    def keys_of_bits(cls, bitmask):
+        """
+        :type bitmask: int
+        :rtype: list[str]
+        """
+        return [key for key, bit in tuple(cls._bits.items()) if bitmask >> bit & 1]
+
+    def __getitem__(self, key):
+        slot_name = self._slot_names.get(key, None)
+        if slot_name is not None:
+            try:
+                return getattr(self, slot_name)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key, default=None):
+        slot_name = self._slot_names.get(key, None)
+        if slot_name is not None:
+            return getattr(self, slot_name, default)
+        return self._extra.get(key, default) if self._extra is not None else default
+
+    def __setitem__(self, key, value):
+        slot_name = self._slot_names.get(key, None)
+        if slot_name is not None:
+            setattr(self, slot_name, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        slot_name = self._slot_names.get(key, None)
+        if slot_name is not None:
+            try:
+                delattr(self, slot_name)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+            if not self._extra:
+                self._extra = None
+
+    def __contains__(self, key):
+        slot_name = self._slot_names.get(key, None)
+        if slot_name is not None:
+            return hasattr(self, slot_name)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for key, slot_name in self._slot_names.items():
+            if hasattr(self, slot_name):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if isinstance(other, (dict, CompactContent)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def keys(self):
+        """
+        :rtype: list[str]
+        """
+        return list(self)
+
+    def items(self):
+        """
+        :rtype: list[(str, object)]
+        """
+        return [(key, self[key]) for key in self]
+
+    def values(self):
+        """
+        :rtype: list[object]
+        """
+        return [self[key] for key in self]
+
+    def update(self, other):
+        """
+        :type other: dict
+        """
+        for key, value in other.items():
+            self[key] = value
+
+
+def compact_content_class(class_name, keys):
+    """Create the content record class of a compact class
+
+    :type class_name: str
+    :param keys: parse names of the declared fields
+    :type keys: collections.Iterable[str]
+    :rtype: type
+    """
+    slot_names = {key: '_{}'.format(i) for i, key in enumerate(keys)}
+    return type('{}Content'.format(class_name), (CompactContent,), {
+        '__slots__': tuple(slot_names.values()),
+        '_slot_names': slot_names,
+        '_bits': {key: i for i, key in enumerate(slot_names)},
+        '_bits_lock': threading.Lock(),
+    })
+
+
+class CompactObjectMixin(object):
+    """
+    Storage of compact `Object` classes (see `Object.compact`): instance attributes are kept in slots, content in a
+    `CompactContent` record, and modified keys are tracked with a bitmask instead of a dict of original values.
+
+    Put in front of the bases of a compact class by `ObjectBase`.
+    """
+
+    __slots__ = ()
+
+    _slots = ('_content', '_dirty', '_raw_keys', '_content_shared', '_operations', '_loaded_keys')
+    """Instance attributes of a compact class"""
+
+    def __init__(self, *args, **kwargs):
+        # Slots have no class-level defaults
+        self._raw_keys = None
+        self._content_shared = False
+        self._operations = None
+        self._loaded_keys = None
+        self._dirty = 0
+        super(CompactObjectMixin, self).__init__(*args, **kwargs)
+
+    @property
+    def dirty(self):
+        """:type: bool"""
+        return self._dirty != 0 or bool(self._operations)
+
+    def _mark_modified(self, key, force=False):
+        # Keys set are always saved, so `force` makes no difference
+        self._dirty |= 1 << self._content_class.bit(key)
+
+    def _is_modified(self, key):
+        return bool(self._dirty & 1 << self._content_class.bit(key))
+
+    def _modified_content(self):
+        """Values of keys set since the last save. Without original values, keys set back to their original value are
+        included too.
+
+        :rtype: dict
+        """
+        return {key: self.get(key) for key in self._content_class.keys_of_bits(self._dirty)}
+
+    def _reset_modified(self):
+        self._dirty = 0
@@ -0,0 +1,85 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import atexit
+import threading
+
+
+class IncrementFlusher(object):
+    """
+    Flush coalesced increments (see `Object.coalesce_increments`) periodically in a background thread. Started by
+    `Object.enable_increment_flusher`.
+    """
+
+    def __init__(self, flush, interval=1.0, flush_on_exit=True, on_error=None):
+        """
+        :param flush: function sending pending increments, e.g. `Object.flush_increments`
+        :type flush: collections.Callable
+        :param interval: seconds between flushes
+        :type interval: float
+        :param flush_on_exit: flush pending increments when the interpreter exits
+        :type flush_on_exit: bool
+        :param on_error: called with the exception when a flush failed. Failed increments stay pending.
+        :type on_error: collections.Callable
+        """
+        self._flush = flush
+        self._interval = interval
+        """:type: float"""
+        self._on_error = on_error
+
+        self.failed = 0
+        """Number of failed flushes
+
+        :type: int"""
+
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._work, name='pyparse-increment-flusher', daemon=True)
+        self._thread.start()
+
+        self._flush_on_exit = flush_on_exit
+        if flush_on_exit:
+            atexit.register(self.flush)
+
+    def _work(self):
+        while not self._stopped.wait(self._interval):
+            self.flush()
+
+    def flush(self):
+        """Send pending increments now
+
+        :return: False if the flush failed
+        :rtype: bool
+        """
+        try:
+            self._flush()
+        except Exception as e:
+            self.failed += 1
+            if self._on_error:
+                self._on_error(e)
+            return False
+        return True
+
+    def close(self, timeout=None):
+        """Stop flushing periodically, and send pending increments
+
+        :param timeout: max seconds to wait for a flush in progress, or None to wait until done
+        :type timeout: float | None
+        """
+        self._stopped.set()
+        self._thread.join(timeout)
+        if self._flush_on_exit:
+            atexit.unregister(self.flush)
+        self.flush()
@@ -15,13 +15,13 @@
 #
 
 from pyparse.core.data.object import Object
-from pyparse.core.data.fields import Field
+from pyparse.core.data.fields import Field, ListField
 
 
 class Installation(Object):
 
     badge = Field()
-    channels = Field()
+    channels = ListField()
     time_zone = Field()
     device_type = Field(readonly=True)
     push_type = Field(readonly=True)
@@ -14,18 +14,141 @@
 # limitations under the License.
 #
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from contextvars import copy_context
 from copy import deepcopy
+import datetime
+from functools import partial
+import threading
+import time
 
+from pyparse import metrics, pyparse
 from pyparse.core.data.base import ObjectBase
 from pyparse.core.data.fields import Field, AutoDateTimeField
+from pyparse.core.data.increments import IncrementFlusher
 from pyparse.core.data.types import ParseConvertible
-from pyparse.request import request_parse
+from pyparse.error import ParseError, ParseBatchError, UnloadedFieldError
+from pyparse.request import Request, request_parse, async_request_parse
+from pyparse.slow_query_log import trace_query
 from pyparse.core.data.query import Query
+from pyparse.utils.cache import LRUCache
+
+# Values of these types are never changed in place, so copies of content can share them
+_immutable_types = frozenset((str, int, float, bool, type(None), bytes, datetime.datetime, datetime.date))
+
+
+def _copy_content(content, content_class=None):
+    """Copy a content dict, sharing immutable values instead of deep-copying them
+
+    >>> labels = ['a']
+    >>> content = {'name': 'Taipei', 'labels': labels}
+    >>> copied = _copy_content(content)
+    >>> copied == content, copied['name'] is content['name'], copied['labels'] is labels
+    (True, True, False)
+
+    :type content: dict | pyparse.core.data.compact.CompactContent
+    :param content_class: type of the copy. Defaults to the type of `content`.
+    :type content_class: type
+    :rtype: dict | pyparse.core.data.compact.CompactContent
+    """
+    content_class = content_class or type(content)
+    if content_class is dict:
+        return {key: value if type(value) in _immutable_types else deepcopy(value) for key, value in content.items()}
+    return content_class((key, value if type(value) in _immutable_types else deepcopy(value))
+                         for key, value in content.items())
+
+
+def _apply_operation(value, operation):
+    """Compute locally the value resulting of a Parse operation
+
+    >>> _apply_operation(['a', 'b'], {'__op': 'AddUnique', 'objects': ['b', 'c', 'c']})
+    ['a', 'b', 'c']
+    >>> _apply_operation(None, {'__op': 'Increment', 'amount': 2})
+    2
+
+    :param value: current value, or None if it's not set
+    :param operation: operation in Parse's representation, with Python values
+    :type operation: dict
+    """
+    op = operation['__op']
+    if op == 'Increment':
+        return (value or 0) + operation['amount']
+    value = list(value or [])
+    if op == 'Add':
+        return value + operation['objects']
+    elif op == 'AddUnique':
+        for obj in operation['objects']:
+            if obj not in value:
+                value.append(obj)
+        return value
+    elif op == 'Remove':
+        return [obj for obj in value if obj not in operation['objects']]
+    raise ValueError('Unsupported operation {}'.format(op))
+
+
+def _merge_operations(previous, operation):
+    """Merge two operations applied to the same key into one
+
+    >>> _merge_operations({'__op': 'Increment', 'amount': 1}, {'__op': 'Increment', 'amount': 2})
+    {'__op': 'Increment', 'amount': 3}
+    >>> _merge_operations({'__op': 'AddUnique', 'objects': ['a']}, {'__op': 'AddUnique', 'objects': ['a', 'b']})
+    {'__op': 'AddUnique', 'objects': ['a', 'b']}
+    >>> _merge_operations({'__op': 'Add', 'objects': ['a']}, {'__op': 'Remove', 'objects': ['a']}) is None
+    True
+
+    :type previous: dict | None
+    :type operation: dict
+    :return: the merged operation, or None if Parse has no single operation doing both
+    :rtype: dict | None
+    """
+    if previous is None:
+        return operation
+    op = operation['__op']
+    if previous['__op'] != op:
+        return None
+    if op == 'Increment':
+        return {'__op': op, 'amount': previous['amount'] + operation['amount']}
+    elif op == 'Add':
+        return {'__op': op, 'objects': previous['objects'] + operation['objects']}
+    else:
+        # AddUnique and Remove are set operations
+        return {'__op': op, 'objects': _apply_operation(previous['objects'], {'__op': 'AddUnique',
+                                                                             'objects': operation['objects']})}
+
+
+def _operation_to_parse(operation):
+    """
+    :type operation: dict
+    :rtype: dict
+    """
+    if 'objects' in operation:
+        return dict(operation, objects=[ParseConvertible.guess_to_parse(obj) for obj in operation['objects']])
+    return operation
+
+
+# Original value of keys whose current value has to be saved even if it's equal to the original one
+_forced = object()
+
+# Objects with increments waiting for `Object.flush_increments`, by id
+_objects_with_pending_increments = {}
+""":type: dict[int, Object]"""
+# Guards pending operations of objects coalescing increments, which may be flushed by another thread
+_increments_lock = threading.RLock()
 
 
 class Object(object, metaclass=ObjectBase):
     """
     key: parse_key
+
+    >>> Object(content={'a': 1})['a']
+    1
+    >>> class CompactCity(Object):
+    ...     compact = True
+    ...     name = Field()
+    >>> city = CompactCity(name='Taipei')
+    >>> city.name, type(city._content).__name__, '_content' in vars(city)
+    ('Taipei', 'CompactCityContent', False)
     """
 
     # Field
@@ -43,39 +166,130 @@ class Object(object, metaclass=ObjectBase):
 
     is_anonymous_class = False
 
+    compact = False
+    """Store instances in a fixed layout: instance attributes in slots (the `__dict__` inherited from `Object` stays
+    empty), declared fields in slots of a `CompactContent` record, and dirty state in a bitmask. It saves much of the
+    memory of an instance, but saving sends every key set since the last save, even if it was set back to its
+    original value. Set by a class declaring its fields, and inherited by its subclasses."""
+
+    _content_class = dict
+    """Type of `_content`"""
+
     @classmethod
     def from_object(cls, another_object):
-        """
+        """Create an object with the content of another one. The content is shared until either of them changes it.
+
+        >>> city = Object(class_name='City', name='Taipei', districts=['Daan'])
+        >>> copied = type(city).from_object(city)
+        >>> copied._content is city._content
+        True
+        >>> copied['districts'].append('Xinyi')
+        >>> copied['name'] = 'Taipei City'
+        >>> city['name'], city['districts'], copied['districts']
+        ('Taipei', ['Daan'], ['Daan', 'Xinyi'])
+
         :type another_object: Object
         :rtype: Object
         """
         assert cls.class_name == another_object.class_name, 'Parse class name of two objects is not the same.'
-        return cls(content=another_object._content)
+        another_object._content_shared = True
+        obj = cls._from_content(another_object._content, shared=True)
+        obj._loaded_keys = another_object._loaded_keys
+        if another_object._raw_keys:
+            obj._raw_keys = set(another_object._raw_keys)
+        return obj
 
     def __init__(self, content=None, **kwargs):
         # Store Parse content
-        self._content = deepcopy(content) or {}
-        """:type: dict"""
+        self._content = _copy_content(content, self._content_class) if content else self._content_class()
+        """:type: dict | pyparse.core.data.compact.CompactContent"""
 
-        self._update(kwargs, check_readonly=False, update_dirty_state=False)
-        self._original_value_of_modified_content = {}
+        if kwargs:
+            self._update(kwargs, check_readonly=False, update_dirty_state=False)
+        self._reset_modified()
+
+    @classmethod
+    def _from_content(cls, content, shared=False):
+        """Create an object which uses `content` without copying it
+
+        :param shared: `content` is also used elsewhere. It's copied before it's changed or a mutable value is read.
+        :type shared: bool
+        :rtype: Object
+        """
+        obj = cls()
+        obj._content = content if type(content) is cls._content_class else cls._content_class(content)
+        if shared:
+            obj._content_shared = True
+        return obj
 
     def __str__(self):
         return repr(self)
 
     def __repr__(self):
+        self._decode_all()
         return repr(self._content)
 
     # Content
 
+    _content_shared = False
+    """`_content` is shared with another object or the cache, so it should be copied before it's changed"""
+
+    def _own_content(self):
+        if self._content_shared:
+            self._content = _copy_content(self._content)
+            self._content_shared = False
+
+    _operations = None
+    """Operations (e.g. `Add`) applied to keys since the last save, which are sent instead of their values
+
+    :type: dict[str, dict] | None"""
+
     @property
     def dirty(self):
         """:type: bool"""
-        return len(self._original_value_of_modified_content) != 0
+        return len(self._original_value_of_modified_content) != 0 or bool(self._operations)
+
+    def _mark_modified(self, key, force=False):
+        """
+        :param force: save the value of `key` even if it's set back to its original value
+        :type force: bool
+        """
+        if force:
+            self._original_value_of_modified_content[key] = _forced
+        elif key not in self._original_value_of_modified_content:
+            self._original_value_of_modified_content[key] = self.get(key)
+
+    def _is_modified(self, key):
+        return key in self._original_value_of_modified_content
+
+    def _modified_content(self):
+        """
+        :return: keys whose value differs from the one they had after the last save, and their current values
+        :rtype: dict
+        """
+        modified_content = {}
+        for modified_key, original_value in self._original_value_of_modified_content.items():
+            current_modified_value = self.get(modified_key)
+            if original_value != current_modified_value:
+                modified_content[modified_key] = current_modified_value
+        return modified_content
+
+    def _reset_modified(self):
+        # Pending operations are taken out by `_save_request`, so those left were done after it
+        self._original_value_of_modified_content = {}
 
     def get(self, key):
         # `key` should be parse key
-        return self._content[key] if key in self._content else None
+        if self._loaded_keys is not None and key not in self._loaded_keys:
+            self._load_unloaded_keys(key)
+        if self._raw_keys and key in self._raw_keys:
+            self._decode(key)
+        value = self._content[key] if key in self._content else None
+        if self._content_shared and type(value) not in _immutable_types:
+            # The caller may change the value in place
+            self._own_content()
+            value = self._content[key]
+        return value
 
     def set(self, key, value):
         self._set(key, value)
@@ -86,9 +300,18 @@ class Object(object, metaclass=ObjectBase):
             if field and field.readonly:
                 raise KeyError('{} is a readonly field.'.format(key))
 
-        if key not in self._original_value_of_modified_content:
-            self._original_value_of_modified_content[key] = self.get(key)
+        if self._operations and key in self._operations:
+            # The value replaces the pending operation
+            del self._operations[key]
+            self._mark_modified(key, force=True)
+        elif self._loaded_keys is not None and key not in self._loaded_keys:
+            # The original value is unknown, and isn't worth a request
+            self._mark_modified(key, force=True)
+            self._loaded_keys = self._loaded_keys | {key}
+        else:
+            self._mark_modified(key)
 
+        self._own_content()
         if value is not None:
             self._content[key] = value
         else:
@@ -98,22 +321,237 @@ class Object(object, metaclass=ObjectBase):
 
     class_name = None
 
+    lazy_decoding = False
+    """Keep values of objects created by `from_parse` in Parse's representation until they are read"""
+
+    _raw_keys = None
+    """:type: set[str] | None"""
+
     @classmethod
-    def from_parse(cls, raw_parse_dict):
-        """
+    def from_parse(cls, raw_parse_dict, lazy=None):
+        """Create an object from data returned by Parse. The data isn't deep-copied, so the object may share values
+        with `raw_parse_dict`, which shouldn't be changed afterwards.
+
+        Lazily decoded values are converted when they are first read, which doesn't make the object dirty. The object
+        cache keeps the values which are still in Parse's representation:
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.core.data.fields import DateTimeField
+        >>> from pyparse.core.data.types import UTC
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class Event(Object):
+        ...     lazy_decoding = True
+        ...     title = Field()
+        ...     start = DateTimeField()
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> Event.enable_cache()
+        >>> Event(title='Launch', start=datetime.datetime(2015, 7, 3, tzinfo=UTC())).save()
+        >>> event = Event.query()[0]
+        >>> event._content['start']
+        {'__type': 'Date', 'iso': '2015-07-03T00:00:00.000Z'}
+        >>> event.start.year, 'start' in event._raw_keys, event.dirty
+        (2015, False, False)
+        >>> cached = Event.fetch(event.object_id)
+        >>> 'start' in cached._raw_keys, cached.start == event.start
+        (True, True)
+        >>> event.title = 'Launch day'
+        >>> event.save()
+        >>> stored = pyparse.transport.objects('Event')[0]
+        >>> stored['title'], stored['start']['iso'], event.dirty
+        ('Launch day', '2015-07-03T00:00:00.000Z', False)
+        >>> Event.disable_cache()
+        >>> pyparse.setup_transport(None)
+
         :type raw_parse_dict: dict
+        :param lazy: decode values on first access. Defaults to `lazy_decoding` of the class.
+        :type lazy: bool | None
         :rtype: Object
         """
-        return cls(cls._parse_dict_to_python_value_dict(raw_parse_dict))
+        if lazy if lazy is not None else cls.lazy_decoding:
+            obj = cls._from_content(cls._content_class(raw_parse_dict))
+            obj._raw_keys = set(raw_parse_dict)
+            return obj
+        return cls._from_content(cls._parse_dict_to_python_value_dict(raw_parse_dict))
+
+    @classmethod
+    def _from_parse_all(cls, raw_parse_dicts, loaded_keys=None):
+        """`from_parse` the objects of a response, reporting the time spent to `pyparse.metrics` hooks
+
+        :type raw_parse_dicts: list[dict]
+        :param loaded_keys: keys requested from Parse if they were restricted (see `Query.only`)
+        :type loaded_keys: frozenset[str] | None
+        :rtype: list[Object]
+        """
+        if not metrics.conversion_hooks:
+            objs = [cls.from_parse(raw_parse_dict) for raw_parse_dict in raw_parse_dicts]
+        else:
+            started_at = time.perf_counter()
+            objs = [cls.from_parse(raw_parse_dict) for raw_parse_dict in raw_parse_dicts]
+            metrics.report_conversion('from_parse', cls.class_name, len(objs), time.perf_counter() - started_at)
+        if loaded_keys is not None:
+            for obj in objs:
+                obj._loaded_keys = loaded_keys
+        return objs
+
+    # Partially loaded objects
+
+    fetch_deferred_fields = True
+    """Fetch the fields left out by `Query.only` or `Query.defer` when one of them is first read. If False, reading
+    them raises `UnloadedFieldError`."""
+
+    _loaded_keys = None
+    """Keys which were requested from Parse, or None if the object is fully loaded
+
+    :type: frozenset[str] | None"""
+
+    def _load_unloaded_keys(self, key):
+        """Fetch the keys which were not loaded, keeping those set since
+
+        :param key: the key being read
+        :type key: str
+        """
+        if not self.fetch_deferred_fields or not self.object_id:
+            raise UnloadedFieldError('{} of {} was not loaded'.format(key, self.class_name))
+        response = request_parse('get', self._remote_path(self.object_id))
+        loaded_keys, self._loaded_keys = self._loaded_keys, None
+        self._update(self._parse_dict_to_python_value_dict({k: v for k, v in response.items() if k not in loaded_keys}),
+                     check_readonly=False, update_dirty_state=False)
 
     @classmethod
     def _parse_dict_to_python_value_dict(cls, raw_parse_dict):
         return {key: cls._to_python_converter(key)(value) for key, value in raw_parse_dict.items()}
 
+    def _decode(self, key):
+        """Convert a value kept in Parse's representation by lazy decoding"""
+        self._raw_keys.discard(key)
+        self._own_content()
+        if key in self._content:
+            self._content[key] = self._to_python_converter(key)(self._content[key])
+
+    def _decode_all(self):
+        if self._raw_keys:
+            for key in list(self._raw_keys):
+                self._decode(key)
+
+    def _operate(self, key, operation):
+        """Apply an operation to the value of `key` locally, and send it as is by the next `save` instead of the whole
+        value. Repeated operations are merged. If they can't be merged, the key has been set, or the object hasn't been
+        created yet, the resulting value is sent instead.
+
+        :type key: str
+        :param operation: operation in Parse's representation, with Python values
+        :type operation: dict
+        """
+        field = self._fields_parse.get(key, None)
+        if field and field.readonly:
+            raise KeyError('{} is a readonly field.'.format(key))
+
+        operations = self._operations
+        previous = operations.get(key, None) if operations else None
+        merged = None
+        if self.object_id and (previous is not None or not self._is_modified(key)):
+            merged = _merge_operations(previous, operation)
+        if merged is not None:
+            if operations is None:
+                operations = self._operations = {}
+            operations[key] = merged
+        elif previous is not None:
+            del operations[key]
+            self._mark_modified(key, force=True)
+        else:
+            self._mark_modified(key)
+
+        value = _apply_operation(self.get(key), operation)
+        self._own_content()
+        self._content[key] = value
+
     # Fields
 
-    def increment(self, field_parse_name, step=1):
-        if self.object_id:
+    def add(self, field_parse_name, *objects):
+        """Append objects to an array field. It's saved with an `Add` operation, so only the objects are sent.
+
+        Operations of a key are merged until the next save. If they can't be merged, the whole value is sent:
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.core.data.fields import ListField
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class Playlist(Object):
+        ...     songs = ListField()
+        ...     tags = ListField()
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> playlist = Playlist(songs=['a'], tags=['rock'])
+        >>> playlist.save()
+        >>> playlist.add_to_songs('b')
+        >>> playlist.add('songs', 'c')
+        >>> playlist.add_unique_to_tags('pop', 'rock')
+        >>> playlist.remove_from_tags('rock')
+        >>> playlist._operations, playlist.tags
+        ({'songs': {'__op': 'Add', 'objects': ['b', 'c']}}, ['pop'])
+        >>> playlist.save()
+        >>> playlist = Playlist.fetch(playlist.object_id)
+        >>> playlist.remove_from_songs('a')
+        >>> playlist.save()
+        >>> stored = pyparse.transport.objects('Playlist')[0]
+        >>> stored['songs'], stored['tags'], playlist.songs
+        (['b', 'c'], ['pop'], ['b', 'c'])
+        >>> pyparse.setup_transport(None)
+
+        :type field_parse_name: str
+        """
+        self._operate(field_parse_name, {'__op': 'Add', 'objects': list(objects)})
+
+    def add_unique(self, field_parse_name, *objects):
+        """Append objects which are not in an array field yet. It's saved with an `AddUnique` operation.
+
+        :type field_parse_name: str
+        """
+        self._operate(field_parse_name, {'__op': 'AddUnique', 'objects': list(objects)})
+
+    def remove(self, field_parse_name, *objects):
+        """Remove all instances of objects from an array field. It's saved with a `Remove` operation.
+
+        :type field_parse_name: str
+        """
+        self._operate(field_parse_name, {'__op': 'Remove', 'objects': list(objects)})
+
+    def increment(self, field_parse_name, step=1, defer=None):
+        """Increment a number field. A saved object is incremented on Parse right away, unless `defer` is True or a
+        change of the field is already pending: then an `Increment` operation (or the new value if the field was set)
+        is sent by the next `save` (or `flush_increments` if the class coalesces increments).
+
+        Deferred increments are merged with a pending `Increment` of the field. Setting the field replaces it:
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.core.data.fields import NumberField
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class Player(Object):
+        ...     score = NumberField()
+        ...     level = NumberField()
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> player = Player(score=10, level=1)
+        >>> player.save()
+        >>> player.increment_score(5, defer=True)
+        >>> player.increment_score(2)
+        >>> player.increment_level(defer=True)
+        >>> player.level = 5
+        >>> player.increment_level()
+        >>> sorted(player._operations), player.score, player.level
+        (['score'], 17, 6)
+        >>> player.save()
+        >>> stored = pyparse.transport.objects('Player')[0]
+        >>> stored['score'], stored['level'], player.dirty
+        (17, 6, False)
+        >>> pyparse.setup_transport(None)
+
+        :type field_parse_name: str
+        :type step: int | float
+        :param defer: defaults to `coalesce_increments`
+        :type defer: bool | None
+        """
+        if defer is None:
+            defer = self.coalesce_increments
+        pending = self._operations and field_parse_name in self._operations or self._is_modified(field_parse_name)
+        if self.object_id and not defer and not pending:
             arguments = {
                 field_parse_name: {
                     '__op': 'Increment',
@@ -123,8 +561,229 @@ class Object(object, metaclass=ObjectBase):
             response = request_parse('put', self._remote_path(self.object_id), arguments=arguments)
             self._update(self._parse_dict_to_python_value_dict(response),
                          check_readonly=False, update_dirty_state=False)
+            self._update_cache()
+            Query.invalidate_result_cache(self.class_name)
+        elif self.coalesce_increments and self.object_id:
+            with _increments_lock:
+                self._operate(field_parse_name, {'__op': 'Increment', 'amount': step})
+                if self._operations and field_parse_name in self._operations:
+                    _objects_with_pending_increments[id(self)] = self
         else:
-            self.set(field_parse_name, self.get(field_parse_name)+step)
+            self._operate(field_parse_name, {'__op': 'Increment', 'amount': step})
+
+    # Coalesced increments
+
+    coalesce_increments = False
+    """Sum increments of saved objects in memory instead of sending them right away. They are sent as one
+    `Increment` operation per field by `save`, or with batch requests by `flush_increments` (which may be called
+    periodically in the background, see `enable_increment_flusher`). Reads reflect pending increments."""
+
+    _increment_flusher = None
+    """:type: IncrementFlusher"""
+
+    @classmethod
+    def flush_increments(cls, max_workers=1, priority=None):
+        """Send the pending increments of objects of all classes coalescing increments, with batch requests. Other
+        changes of the objects are not saved.
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.core.data.fields import NumberField
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class Page(Object):
+        ...     coalesce_increments = True
+        ...     views = NumberField()
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> pages = [Page(views=0), Page(views=0)]
+        >>> Object.save_all(pages)
+        >>> for page in pages:
+        ...     page.increment_views()
+        ...     page.increment_views(2)
+        >>> pages[0].views, pyparse.transport.objects('Page')[0]['views']
+        (3, 0)
+        >>> Page.flush_increments()
+        >>> sorted(page['views'] for page in pyparse.transport.objects('Page')), pages[0].dirty
+        ([3, 3], False)
+
+        Saving an object sends its pending increments too, so it isn't flushed anymore:
+
+        >>> pages[0].increment_views()
+        >>> pages[0].save()
+        >>> id(pages[0]) in _objects_with_pending_increments
+        False
+        >>> pyparse.setup_transport(None)
+
+        :param max_workers: number of batch requests sent concurrently
+        :type max_workers: int
+        :param priority: priority of the requests when requests are scheduled, e.g. `BULK` of `pyparse.scheduler`
+        :type priority: str
+        :raise ParseBatchError: if increments of any of the objects failed to be sent. They stay pending.
+        """
+        with _increments_lock:
+            objects = list(_objects_with_pending_increments.values())
+            _objects_with_pending_increments.clear()
+            # Taken out of pending operations while they're sent, so increments done meanwhile add up separately
+            taken = [(obj, obj._take_increments()) for obj in objects]
+        taken = [(obj, increments) for obj, increments in taken if increments]
+
+        flushed = set()
+
+        def did_flush(obj, increments):
+            def callback(response):
+                obj._did_flush_increments(increments, response)
+                flushed.add(id(obj))
+            return callback
+
+        operations = [(obj, ('put', obj._remote_path(obj.object_id),
+                             {key: _operation_to_parse(operation) for key, operation in increments.items()}),
+                       did_flush(obj, increments))
+                      for obj, increments in taken]
+        try:
+            cls._batch(operations, max_workers=max_workers, priority=priority)
+        finally:
+            for obj, increments in taken:
+                if id(obj) not in flushed:
+                    obj._restore_operations(increments)
+
+    @classmethod
+    def enable_increment_flusher(cls, interval=1.0, max_workers=1, priority=None, flush_on_exit=True, on_error=None):
+        """Call `flush_increments` every `interval` seconds in a background thread
+
+        Increments which failed to be sent are kept, and sent by a later flush:
+
+        >>> import threading
+        >>> from pyparse import pyparse
+        >>> from pyparse.core.data.fields import NumberField
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class DownOnceServer(FakeParseServer):
+        ...     down = True
+        ...     def request(self, verb, url, **kwargs):
+        ...         if url.endswith('/batch') and self.down:
+        ...             self.down = False
+        ...             raise ConnectionError('connection refused')
+        ...         return super(DownOnceServer, self).request(verb, url, **kwargs)
+        >>> class Video(Object):
+        ...     coalesce_increments = True
+        ...     plays = NumberField()
+        >>> pyparse.setup_transport(DownOnceServer())
+        >>> video = Video(plays=0)
+        >>> video.save()
+        >>> video.increment_plays(3)
+        >>> failed = threading.Event()
+        >>> _ = Video.enable_increment_flusher(interval=0.05, flush_on_exit=False, on_error=lambda e: failed.set())
+        >>> failed.wait(5)
+        True
+        >>> Video.disable_increment_flusher()
+        >>> video.plays, pyparse.transport.objects('Video')[0]['plays'], video.dirty
+        (3, 3, False)
+        >>> pyparse.setup_transport(None)
+
+        :type interval: float
+        :type max_workers: int
+        :type priority: str
+        :param flush_on_exit: flush pending increments when the interpreter exits
+        :type flush_on_exit: bool
+        :param on_error: called with the exception when a flush failed
+        :type on_error: collections.Callable
+        :rtype: IncrementFlusher
+        """
+        Object.disable_increment_flusher()
+        Object._increment_flusher = IncrementFlusher(
+            lambda: cls.flush_increments(max_workers=max_workers, priority=priority),
+            interval=interval, flush_on_exit=flush_on_exit, on_error=on_error)
+        return Object._increment_flusher
+
+    @classmethod
+    def disable_increment_flusher(cls, timeout=None):
+        """Stop flushing increments in the background, and flush pending ones
+
+        :type timeout: float | None
+        """
+        flusher, Object._increment_flusher = Object._increment_flusher, None
+        if flusher:
+            flusher.close(timeout=timeout)
+
+    def _take_increments(self):
+        """Remove pending `Increment` operations. Called with `_increments_lock` held.
+
+        :rtype: dict[str, dict] | None
+        """
+        if not self.object_id or not self._operations:
+            return None
+        increments = {key: operation for key, operation in self._operations.items()
+                      if operation['__op'] == 'Increment'}
+        for key in increments:
+            del self._operations[key]
+        return increments
+
+    def _did_flush_increments(self, increments, response):
+        """Called by `_batch`, which invalidates the result cache once for all objects
+
+        :type increments: dict[str, dict]
+        :type response: dict
+        """
+        with _increments_lock:
+            values = self._response_values({key: value for key, value in response.items()
+                                            if key in increments or key == 'updatedAt'})
+            self._update(values, check_readonly=False, update_dirty_state=False)
+        self._update_cache()
+
+    def _take_operations(self):
+        """Remove pending operations to send them. The object isn't waiting for `flush_increments` anymore, unless
+        operations are restored by `_restore_operations`.
+
+        :rtype: dict[str, dict] | None
+        """
+        if not self.coalesce_increments:
+            operations, self._operations = self._operations, None
+            return operations
+        with _increments_lock:
+            operations, self._operations = self._operations, None
+            _objects_with_pending_increments.pop(id(self), None)
+            return operations
+
+    def _restore_operations(self, operations):
+        """Put operations which failed to be sent back into pending operations, before those done since
+
+        :type operations: dict[str, dict] | None
+        """
+        if not operations:
+            return
+        with _increments_lock:
+            for key, operation in operations.items():
+                pending = self._operations.get(key, None) if self._operations else None
+                if pending is None:
+                    if self._is_modified(key):
+                        # Set since: the value includes the operation
+                        continue
+                    merged = operation
+                else:
+                    merged = _merge_operations(operation, pending)
+                    if merged is None:
+                        # No single operation does both, so the resulting value is sent instead
+                        del self._operations[key]
+                        self._mark_modified(key, force=True)
+                        continue
+                if self._operations is None:
+                    self._operations = {}
+                self._operations[key] = merged
+            if self.coalesce_increments and self._operations:
+                _objects_with_pending_increments[id(self)] = self
+
+    def _response_values(self, response):
+        """Convert the values returned by Parse after operations were sent. Operations done since are applied to the
+        returned values, and keys set since are left out.
+
+        :type response: dict
+        :rtype: dict
+        """
+        values = {}
+        for key, value in response.items():
+            pending = self._operations.get(key, None) if self._operations else None
+            if pending is None and self._is_modified(key):
+                continue
+            value = self._to_python_converter(key)(value)
+            values[key] = _apply_operation(value, pending) if pending is not None else value
+        return values
 
     @classmethod
     def _to_parse_converter(cls, field_name):
@@ -142,6 +801,85 @@ class Object(object, metaclass=ObjectBase):
     def _python_key_from_parse_key(self, parse_key):
         return self._fields_parse[parse_key].python_name
 
+    # Cache
+
+    _cache = None
+    """Content of cached objects by (class name, object id), with the keys whose values are not decoded yet
+
+    :type: LRUCache"""
+
+    @classmethod
+    def enable_cache(cls, max_size=1000, ttl=None):
+        """Cache objects of this class (and its subclasses) by object id, and serve `fetch` from the cache if possible.
+
+        The cache is filled by `fetch`, `Query.fetch` and `save`, and entries are dropped by `delete`. Every hit returns
+        a new object sharing the cached content copy-on-write, so changing a fetched object never changes the cache.
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class Album(Object):
+        ...     title = Field()
+        ...     tracks = Field()
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> Album.enable_cache()
+        >>> album = Album(title='Blue', tracks=['A Case of You'])
+        >>> album.save()
+        >>> fetched = Album.fetch(album.object_id)
+        >>> fetched.tracks.append('River')
+        >>> fetched.title = 'Blue (Remastered)'
+        >>> cached = Album.fetch(album.object_id)
+        >>> cached.title, cached.tracks, Album.cache_stats()['hits']
+        ('Blue', ['A Case of You'], 2)
+        >>> Album.disable_cache()
+        >>> pyparse.setup_transport(None)
+
+        :param max_size: max number of cached objects. Least recently used ones are evicted first.
+        :type max_size: int
+        :param ttl: seconds before a cached object expires, or None to keep it until it's evicted
+        :type ttl: float | None
+        """
+        cls._cache = LRUCache(max_size=max_size, ttl=ttl)
+
+    @classmethod
+    def disable_cache(cls):
+        cls._cache = None
+
+    @classmethod
+    def cache_stats(cls):
+        """
+        :return: hits, misses, evictions and size of the cache of this class, or None if caching is disabled
+        :rtype: dict[str, int] | None
+        """
+        return cls._cache.stats if cls._cache is not None else None
+
+    @classmethod
+    def _cached(cls, object_id):
+        """
+        :type object_id: str
+        :rtype: Object | None
+        """
+        if cls._cache is None:
+            return None
+        cached = cls._cache.get((cls.class_name, object_id))
+        if cached is None:
+            return None
+        content, raw_keys = cached
+        obj = cls._from_content(content, shared=True)
+        if raw_keys:
+            # Still in Parse's representation. They're decoded into a copy of the content when they're read.
+            obj._raw_keys = set(raw_keys)
+        return obj
+
+    def _update_cache(self):
+        if self._cache is not None and self.object_id:
+            if self._loaded_keys is not None:
+                # It would be served as a whole object
+                self._cache.discard((self.class_name, self.object_id))
+                return
+            self._content_shared = True
+            self._cache.set((self.class_name, self.object_id),
+                            (self._content, frozenset(self._raw_keys) if self._raw_keys else None))
+
     # Remote
 
     @classmethod
@@ -156,7 +894,28 @@ class Object(object, metaclass=ObjectBase):
         :return:
         :rtype: Object
         """
-        return cls.from_parse(request_parse('get', cls._remote_path(object_id)))
+        with trace_query(pyparse.slow_query_log, 'get', cls.class_name, {'where': {'objectId': object_id}}) as trace:
+            obj = cls._cached(object_id)
+            if obj is None:
+                obj = cls._from_parse_all([request_parse('get', cls._remote_path(object_id))])[0]
+                obj._update_cache()
+            trace.rows = 1
+        return obj
+
+    @classmethod
+    async def afetch(cls, object_id):
+        """Fetch an object with the asyncio API
+
+        :type object_id: str
+        :rtype: Object
+        """
+        with trace_query(pyparse.slow_query_log, 'get', cls.class_name, {'where': {'objectId': object_id}}) as trace:
+            obj = cls._cached(object_id)
+            if obj is None:
+                obj = cls._from_parse_all([await async_request_parse('get', cls._remote_path(object_id))])[0]
+                obj._update_cache()
+            trace.rows = 1
+        return obj
 
     @classmethod
     def query(cls):
@@ -166,20 +925,139 @@ class Object(object, metaclass=ObjectBase):
         """
         return Query(cls)
 
-    def save(self):
+    def save(self, priority=None):
+        """
+        Array and number changes are sent as operations (see `add` and `increment`). Operations done while the request
+        is in flight are kept for the next save, and those sent are kept too if the request fails:
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.core.data.fields import NumberField
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class InterruptedServer(FakeParseServer):
+        ...     during_request = None
+        ...     def request(self, verb, url, **kwargs):
+        ...         during_request, self.during_request = self.during_request, None
+        ...         if during_request:
+        ...             during_request()
+        ...         return super(InterruptedServer, self).request(verb, url, **kwargs)
+        >>> class Post(Object):
+        ...     likes = NumberField()
+        >>> pyparse.setup_transport(InterruptedServer())
+        >>> post = Post(likes=0)
+        >>> post.save()
+        >>> post.increment_likes(defer=True)
+        >>> pyparse.transport.during_request = lambda: post.increment_likes(10, defer=True)
+        >>> post.save()
+        >>> post.likes, pyparse.transport.objects('Post')[0]['likes'], post.dirty
+        (11, 1, True)
+        >>> def disconnect():
+        ...     raise ConnectionError('connection reset')
+        >>> pyparse.transport.during_request = disconnect
+        >>> try:
+        ...     post.save()
+        ... except ConnectionError:
+        ...     post.dirty
+        True
+        >>> post.save()
+        >>> post.likes, pyparse.transport.objects('Post')[0]['likes'], post.dirty
+        (11, 11, False)
+
+        Operations are kept as well if the payload can't be built, e.g. a value can't be converted:
+
+        >>> from pyparse.core.data.fields import GeoPointField
+        >>> class Place(Object):
+        ...     coalesce_increments = True
+        ...     views = NumberField()
+        ...     location = GeoPointField()
+        >>> places = [Place(views=0), Place(views=0)]
+        >>> Object.save_all(places)
+        >>> for place in places:
+        ...     place.increment_views(5)
+        >>> places[1].location = 'nowhere'
+        >>> for save in (places[1].save, lambda: Object.save_all(places)):
+        ...     try:
+        ...         save()
+        ...     except AttributeError:
+        ...         pass
+        >>> [place._operations for place in places]
+        [{'views': {'__op': 'Increment', 'amount': 5}}, {'views': {'__op': 'Increment', 'amount': 5}}]
+        >>> places[1].location = None
+        >>> Object.save_all(places)
+        >>> [place['views'] for place in pyparse.transport.objects('Place')]
+        [5, 5]
+        >>> pyparse.setup_transport(None)
+
+        :param priority: priority of the request when requests are scheduled, e.g. `BULK` of `pyparse.scheduler`
+        :type priority: str
+        """
+        save_request = self._save_request()
+        if not save_request:
+            return
+
+        verb, remote_path, payload, operations = save_request
+        try:
+            response = request_parse(verb, remote_path, arguments=payload, priority=priority)
+        except Exception:
+            self._restore_operations(operations)
+            raise
+        self._did_save(response)
+
+    async def asave(self, priority=None):
+        """Save this object with the asyncio API. `afetch` and `adelete` are the asyncio counterparts of `fetch` and
+        `delete` too.
+
+        >>> import asyncio
+        >>> from pyparse import pyparse
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class Song(Object):
+        ...     title = Field()
+        >>> async def main():
+        ...     song = Song(title='Intro')
+        ...     await song.asave()
+        ...     song.title = 'Outro'
+        ...     await song.asave()
+        ...     fetched = await Song.afetch(song.object_id)
+        ...     await fetched.adelete()
+        ...     try:
+        ...         await Song.afetch(song.object_id)
+        ...     except ParseError as e:
+        ...         return fetched.title, fetched.object_id, e.code
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> asyncio.run(main())
+        ('Outro', None, 101)
+        >>> pyparse.setup_transport(None)
+
+        :type priority: str
+        """
+        save_request = self._save_request()
+        if not save_request:
+            return
+
+        verb, remote_path, payload, operations = save_request
+        try:
+            response = await async_request_parse(verb, remote_path, arguments=payload, priority=priority)
+        except Exception:
+            self._restore_operations(operations)
+            raise
+        self._did_save(response)
+
+    def _save_request(self):
+        """Build the request saving this object. Pending operations are taken out of the object, so those done while
+        the request is in flight are kept for the next save. Pass the operations returned to `_restore_operations` if
+        the request fails.
+
+        :return: verb, path and payload used to save this object, and the operations sent, or None if there's nothing
+                 to save
+        :rtype: (str, str, dict, dict | None) | None
+        """
         if self.object_id:
             if not self.dirty:
-                return
+                return None
 
             # Update object
-            payload = {}
-            for modified_key, original_value in self._original_value_of_modified_content.items():
-                current_modified_value = self.get(modified_key)
-                if original_value != current_modified_value:
-                    payload[modified_key] = current_modified_value
-            if not payload:
-                return
-
+            payload = self._modified_content()
+            if not payload and not self._operations:
+                return None
             remote_path = self._remote_path(self.object_id)
             verb = 'put'
         else:
@@ -191,35 +1069,233 @@ class Object(object, metaclass=ObjectBase):
         # Convert Python obj in payload to Parse obj
         payload = {key: self._to_parse_converter(key)(value) for key, value in payload.items()}
 
-        response = request_parse(verb, remote_path, arguments=payload)
+        # Operations are taken last, so they're still pending if anything above fails
+        operations = self._take_operations() if self.object_id else None
+        if operations:
+            try:
+                for key, operation in operations.items():
+                    payload[key] = _operation_to_parse(operation)
+            except Exception:
+                self._restore_operations(operations)
+                raise
+        return verb, remote_path, payload, operations
+
+    def _did_save(self, response, invalidate_result_cache=True):
+        """
+        :type response: dict
+        :param invalidate_result_cache: drop cached query results of the class. Batches do it once for all objects.
+        :type invalidate_result_cache: bool
+        """
         if self.object_id:
             # Updated - clean up
-            self._original_value_of_modified_content = {}
+            with _increments_lock if self.coalesce_increments else nullcontext():
+                values = self._response_values(response)
+                self._reset_modified()
+                self._update(values, check_readonly=False, update_dirty_state=False)
         else:
             # New created - update info
             response['updatedAt'] = response['createdAt']
+            self._reset_modified()
+            self._update(self._parse_dict_to_python_value_dict(response),
+                         check_readonly=False, update_dirty_state=False)
 
-        self._content.update(self._parse_dict_to_python_value_dict(response))
+        self._update_cache()
+        if invalidate_result_cache:
+            Query.invalidate_result_cache(self.class_name)
 
-    def delete(self):
+    def delete(self, priority=None):
+        """
+        :param priority: priority of the request when requests are scheduled, e.g. `BULK` of `pyparse.scheduler`
+        :type priority: str
+        """
+        if not self.object_id:
+            return
+        request_parse('delete', self._remote_path(self.object_id), priority=priority)
+        self._did_delete()
+
+    async def adelete(self, priority=None):
+        """Delete this object with the asyncio API
+
+        :type priority: str
+        """
         if not self.object_id:
             return
-        request_parse('delete', self._remote_path(self.object_id))
+        await async_request_parse('delete', self._remote_path(self.object_id), priority=priority)
+        self._did_delete()
+
+    def _did_delete(self, response=None, invalidate_result_cache=True):
+        # Pending operations can't be sent anymore
+        self._take_operations()
+        if self._cache is not None:
+            self._cache.discard((self.class_name, self.object_id))
+        if invalidate_result_cache:
+            Query.invalidate_result_cache(self.class_name)
+        self._own_content()
         del self._content['objectId']
+        if self._raw_keys:
+            self._raw_keys.discard('objectId')
 
-    # Object - Use Python Key/Attribute
+    # Batch
 
-    def __getattribute__(self, key):
-        if key != '_fields_python' and key in self._fields_python:
-            return self.get(self._parse_key_from_python_key(key))
-        else:
-            return super(Object, self).__getattribute__(key)
+    batch_size = 50
+    """Max number of operations Parse accepts in one batch request"""
+
+    @classmethod
+    def save_all(cls, objects, max_workers=1, priority=None):
+        """Create or update objects with Parse's batch API. Objects which are not dirty are skipped.
+
+        When some batch requests fail, objects of the others are still saved:
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class FlakyServer(FakeParseServer):
+        ...     batches = 0
+        ...     def request(self, verb, url, **kwargs):
+        ...         if url.endswith('/batch'):
+        ...             self.batches += 1
+        ...             if self.batches == 2:
+        ...                 raise ConnectionError('connection reset')
+        ...         return super(FlakyServer, self).request(verb, url, **kwargs)
+        >>> class City(Object):
+        ...     batch_size = 2
+        ...     name = Field()
+        >>> pyparse.setup_transport(FlakyServer())
+        >>> cities = [City(name=str(i)) for i in range(5)]
+        >>> try:
+        ...     City.save_all(cities)
+        ... except ParseBatchError as e:
+        ...     [city.name for city in e.objects], type(e.errors[0][1]).__name__
+        (['2', '3'], 'ConnectionError')
+        >>> [city.object_id is not None for city in cities]
+        [True, True, False, False, True]
+        >>> City.save_all(cities[2:4])
+        >>> len(pyparse.transport.objects('City'))
+        5
+        >>> pyparse.setup_transport(None)
+
+        :param objects: objects to be saved. They don't have to be of the same class.
+        :type objects: collections.Iterable[Object]
+        :param max_workers: number of batch requests sent concurrently
+        :type max_workers: int
+        :param priority: priority of the requests when requests are scheduled, e.g. `BULK` of `pyparse.scheduler`
+        :type priority: str
+        :raise ParseBatchError: if any of the objects failed to be saved, including objects of batch requests which got
+                                no response. Others are still saved.
+        """
+        saved = set()
+
+        def did_save(obj):
+            def callback(response):
+                obj._did_save(response, invalidate_result_cache=False)
+                saved.add(id(obj))
+            return callback
 
-    def __setattr__(self, key, value):
-        if key in self._fields_parse:
-            return self.set(self._parse_key_from_python_key(key), value)
+        operations = []
+        taken = []
+        try:
+            for obj in objects:
+                save_request = obj._save_request()
+                if save_request:
+                    verb, remote_path, payload, sent_operations = save_request
+                    operations.append((obj, (verb, remote_path, payload), did_save(obj)))
+                    if sent_operations:
+                        taken.append((obj, sent_operations))
+            cls._batch(operations, max_workers=max_workers, priority=priority)
+        finally:
+            for obj, sent_operations in taken:
+                if id(obj) not in saved:
+                    obj._restore_operations(sent_operations)
+
+    @classmethod
+    def delete_all(cls, objects, max_workers=1, priority=None):
+        """Delete objects with Parse's batch API. Objects which haven't been saved are skipped.
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> notes = [Object(class_name='Note', text=str(i)) for i in range(3)]
+        >>> Object.save_all(notes)
+        >>> type(notes[1]).fetch(notes[1].object_id).delete()
+        >>> try:
+        ...     Object.delete_all(notes)
+        ... except ParseBatchError as e:
+        ...     [note['text'] for note in e.objects], e.code
+        (['1'], 101)
+        >>> pyparse.transport.objects('Note'), [note.object_id is None for note in notes]
+        ([], [True, False, True])
+        >>> pyparse.setup_transport(None)
+
+        :param objects: objects to be deleted. They don't have to be of the same class.
+        :type objects: collections.Iterable[Object]
+        :param max_workers: number of batch requests sent concurrently
+        :type max_workers: int
+        :param priority: priority of the requests when requests are scheduled, e.g. `BULK` of `pyparse.scheduler`
+        :type priority: str
+        :raise ParseBatchError: if any of the objects failed to be deleted. Others are still deleted.
+        """
+        operations = [(obj, ('delete', obj._remote_path(obj.object_id), None),
+                       partial(obj._did_delete, invalidate_result_cache=False))
+                      for obj in objects if obj.object_id]
+        cls._batch(operations, max_workers=max_workers, priority=priority)
+
+    @classmethod
+    def _batch(cls, operations, max_workers=1, priority=None):
+        """
+        :param operations: (object, (verb, path, payload), callback with the success response) tuples
+        :type operations: list[(Object, (str, str, dict), collections.Callable)]
+        :type max_workers: int
+        :type priority: str
+        :raise ParseBatchError: if any of the operations failed, after the callbacks of the others are called
+        """
+        try:
+            cls._send_batch(operations, max_workers=max_workers, priority=priority)
+        finally:
+            # Once per class instead of once per object. Failed batch requests may have been applied too.
+            for class_name in {obj.class_name for obj, _, _ in operations}:
+                Query.invalidate_result_cache(class_name)
+
+    @classmethod
+    def _send_batch(cls, operations, max_workers=1, priority=None):
+        chunks = [operations[i:i+cls.batch_size] for i in range(0, len(operations), cls.batch_size)]
+
+        def send(chunk):
+            batch_requests = []
+            for _, (verb, remote_path, payload), _ in chunk:
+                batch_request = {'method': verb.upper(), 'path': Request.generate_path(remote_path)}
+                if payload is not None:
+                    batch_request['body'] = payload
+                batch_requests.append(batch_request)
+
+            try:
+                return request_parse('post', 'batch', arguments={'requests': batch_requests}, priority=priority)
+            except (ParseError, ConnectionError, TimeoutError, ValueError) as e:
+                # The whole chunk failed. Without a response, whether its operations were applied is unknown.
+                return e
+
+        errors = []
+
+        def did_send(chunk, chunk_results):
+            if isinstance(chunk_results, Exception):
+                errors.extend((obj, chunk_results) for obj, _, _ in chunk)
+                return
+            for (obj, _, callback), result in zip(chunk, chunk_results):
+                if 'success' in result:
+                    callback(result['success'])
+                else:
+                    errors.append((obj, ParseError(result['error']['code'], result['error']['error'])))
+
+        if max_workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Run each chunk in the context of the caller, so the priority of the context applies to the workers
+                futures = [executor.submit(copy_context().run, send, chunk) for chunk in chunks]
+                for chunk, future in zip(chunks, futures):
+                    did_send(chunk, future.result())
         else:
-            return super(Object, self).__setattr__(key, value)
+            for chunk in chunks:
+                did_send(chunk, send(chunk))
+
+        if errors:
+            raise ParseBatchError(errors)
 
     # Dict - Use Parse Key
 
@@ -242,6 +1318,8 @@ class Object(object, metaclass=ObjectBase):
         """
         :rtype: collections.Iterable[(str, object)]
         """
+        self._decode_all()
+        self._own_content()
         return self._content.items()
 
     def keys(self):
@@ -254,6 +1332,8 @@ class Object(object, metaclass=ObjectBase):
         """
         :rtype: collections.Iterable[object]
         """
+        self._decode_all()
+        self._own_content()
         return self._content.values()
 
     def update(self, other=None, **kwargs):
@@ -280,6 +1360,9 @@ class Object(object, metaclass=ObjectBase):
             for key, value in update_dict.items():
                 self._set(key, value, check_readonly=check_readonly)
         else:
+            if self._raw_keys:
+                self._raw_keys.difference_update(update_dict)
+            self._own_content()
             return self._content.update(update_dict)
 
     @property
@@ -287,4 +1370,5 @@ class Object(object, metaclass=ObjectBase):
         """
         :rtype: dict
         """
-        return deepcopy(self._content)
+        self._decode_all()
+        return _copy_content(self._content, dict)
@@ -14,12 +14,21 @@
 # limitations under the License.
 #
 
-from copy import copy
+import base64
+from contextvars import copy_context
+from copy import copy, deepcopy
 import json
+import queue
+import threading
 
+from pyparse import pyparse
+from pyparse.core.data.columns import Columns
 from pyparse.core.data.types import ParseConvertible
 from pyparse.core.data.object import ObjectBase
-from pyparse.request import request_parse
+from pyparse.request import request_parse, async_request_parse
+from pyparse.slow_query_log import trace_query
+from pyparse.utils.cache import LRUCache
+from pyparse.utils.strings import camelcase
 
 
 class Query(object):
@@ -34,6 +43,10 @@ class Query(object):
         self._arguments = {}
         self._order_list = []
         self._where_dict = {}
+        self._keys = None
+        """:type: frozenset[str] | None"""
+        self._use_result_cache = True
+        self._priority = None
 
         # self._evaluated = False
         self._contents = None
@@ -78,6 +91,23 @@ class Query(object):
 
     def filter(self, **kwargs):
         """
+        Operators are appended to keys after a double underscore, and sent in Parse's camel case.
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.core import Object
+        >>> from pyparse.core.data.types import GeoPoint
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> Object.save_all(Object(class_name='Spot', name=name, location=GeoPoint(latitude, longitude))
+        ...                 for name, latitude, longitude in (('Taipei', 25.04, 121.53), ('Tainan', 22.99, 120.21)))
+        >>> query = Query(class_name='Spot').filter(location__near_sphere=GeoPoint(25.03, 121.56),
+        ...                                         location__max_distance_in_kilometers=100)
+        >>> sorted(json.loads(query.get_arguments()['where'])['location'])
+        ['$maxDistanceInKilometers', '$nearSphere']
+        >>> [spot['name'] for spot in query]
+        ['Taipei']
+        >>> pyparse.setup_transport(None)
+
         :return:
         :rtype: Query
         """
@@ -117,7 +147,7 @@ class Query(object):
                     if key_query is None:
                         key_query = {}
                         self._where_dict[key] = key_query
-                    key_query['${}'.format(operator)] = value
+                    key_query['${}'.format(camelcase(operator))] = value
             else:
                 # TODO: relational?
                 pass
@@ -153,6 +183,120 @@ class Query(object):
         self._arguments['skip'] = offset
         return self
 
+    # Projection
+
+    # Parse always returns these keys
+    _always_loaded_keys = frozenset(('objectId', 'createdAt', 'updatedAt'))
+
+    def _parse_names(self, fields):
+        # noinspection PyProtectedMember
+        fields_python = self._object_class._fields_python
+        return {fields_python[name].parse_name if name in fields_python else name for name in fields}
+
+    def only(self, *fields):
+        """Request only the given fields. Objects are partially loaded: reading another field fetches the rest of the
+        object, or raises `UnloadedFieldError` (see `Object.fetch_deferred_fields`). Saving them only sends the fields
+        changed since.
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.core import Object
+        >>> from pyparse.core.data.fields import Field
+        >>> from pyparse.error import UnloadedFieldError
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class Article(Object):
+        ...     title = Field()
+        ...     body = Field()
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> Article(title='Hello', body='World').save()
+        >>> article = Article.query().only('title')[0]
+        >>> sorted(article.keys())
+        ['createdAt', 'objectId', 'title', 'updatedAt']
+        >>> article.title = 'Hi'
+        >>> article.body, article.title
+        ('World', 'Hi')
+        >>> article.save()
+        >>> stored = pyparse.transport.objects('Article')[0]
+        >>> stored['title'], stored['body']
+        ('Hi', 'World')
+        >>> class StrictArticle(Article):
+        ...     class_name = 'Article'
+        ...     fetch_deferred_fields = False
+        >>> article = StrictArticle.query().defer('body')[0]
+        >>> try:
+        ...     article.body
+        ... except UnloadedFieldError as e:
+        ...     article.title, e.args[0]
+        ('Hi', 'body of Article was not loaded')
+        >>> pyparse.setup_transport(None)
+
+        :param fields: python or parse names of the fields
+        :type fields: str
+        :return:
+        :rtype: Query
+        """
+        assert not self.evaluated, 'A {} object is immutable after evaluated'.format(self.__class__.__name__)
+        self._keys = frozenset(self._parse_names(fields)) | self._always_loaded_keys
+        return self
+
+    def defer(self, *fields):
+        """Request all fields declared by the object class but the given ones. Objects are partially loaded like with
+        `only`. Keys which are not declared as fields are not requested either, so the class must declare fields other
+        than the ones Parse always returns.
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.core import Object
+        >>> from pyparse.core.data.fields import Field
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class Book(Object):
+        ...     title = Field()
+        ...     summary = Field()
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> Book(title='Dune', summary='Spice').save()
+        >>> query = Book.query().defer('summary')
+        >>> query.get_arguments()['keys']
+        'createdAt,objectId,title,updatedAt'
+        >>> book = query[0]
+        >>> book.title, 'summary' in book.keys()
+        ('Dune', False)
+        >>> Query(class_name='Book').defer('summary')  # doctest: +ELLIPSIS
+        Traceback (most recent call last):
+          ...
+        AssertionError: defer needs fields declared by the Object class. Use only instead...
+        >>> pyparse.setup_transport(None)
+
+        :param fields: python or parse names of the fields
+        :type fields: str
+        :return:
+        :rtype: Query
+        """
+        assert not self.evaluated, 'A {} object is immutable after evaluated'.format(self.__class__.__name__)
+        # noinspection PyProtectedMember
+        declared_keys = frozenset(self._object_class._fields_parse) - self._always_loaded_keys
+        assert declared_keys, 'defer needs fields declared by the Object class. Use only instead.'
+        keys = self._keys if self._keys is not None else declared_keys | self._always_loaded_keys
+        self._keys = keys - self._parse_names(fields)
+        return self
+
+    def fresh(self):
+        """Bypass the result cache: always request Parse for this query (the result is still cached for others)
+
+        :return:
+        :rtype: Query
+        """
+        assert not self.evaluated, 'A {} object is immutable after evaluated'.format(self.__class__.__name__)
+        self._use_result_cache = False
+        return self
+
+    def with_priority(self, priority):
+        """Send requests of this query with `priority` (e.g. `BULK` of `pyparse.scheduler`) when requests are scheduled
+
+        :return:
+        :rtype: Query
+        """
+        assert not self.evaluated, 'A {} object is immutable after evaluated'.format(self.__class__.__name__)
+        self._priority = priority
+        return self
+
     # Requests
 
     def get_arguments(self, **extra):
@@ -164,7 +308,9 @@ class Query(object):
         if self._order_list:
             arguments['order'] = ','.join(self._order_list)
         if self._where_dict:
-            arguments['where'] = json.dumps(self._where_dict, separators=(',', ':'))
+            arguments['where'] = json.dumps(self._where_dict, separators=(',', ':'), sort_keys=True)
+        if self._keys is not None:
+            arguments['keys'] = ','.join(sorted(self._keys))
 
         arguments.update(extra)
         return arguments
@@ -194,16 +340,162 @@ class Query(object):
 
         return self._contents
 
+    def iterate(self, page_size=100, key='objectId', cursor=None, prefetch=0):
+        """Iterate over all objects satisfying this query, page by page, without using `skip`
+
+        Pages are ordered and split by `key` (`objectId` or `createdAt`), so the cost of each page doesn't grow with
+        the position in the scan. Objects are yielded lazily. The `cursor` of the returned iterator can be saved and
+        passed back in to resume the scan right after the last yielded object. A `limit` of the query caps the number
+        of objects yielded (from the cursor if it's resumed).
+
+        >>> from pyparse import pyparse
+        >>> from pyparse.core import Object
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> Object.save_all(Object(class_name='Item', n=i) for i in range(7))
+        >>> query = Query(class_name='Item').filter(**{'$or': [{'n': {'$lt': 2}}, {'n': {'$gt': 3}}]})
+        >>> sorted(item['n'] for item in query.iterate(page_size=2, key='createdAt'))
+        [0, 1, 4, 5, 6]
+        >>> iterator = Query(class_name='Item').limit(3).iterate(page_size=2)
+        >>> len(list(iterator)), len(list(Query(class_name='Item').iterate(cursor=iterator.cursor)))
+        (3, 4)
+        >>> sorted(item['n'] for item in Query(class_name='Item').filter(n__gte=3).iterate(page_size=2, prefetch=1))
+        [3, 4, 5, 6]
+        >>> pyparse.setup_transport(None)
+
+        :param page_size: number of objects requested per page
+        :type page_size: int
+        :param key: the key used to order and split pages. Either `objectId` or `createdAt` (python names work too).
+        :type key: str
+        :param cursor: a cursor token of a previous scan to resume from
+        :type cursor: str
+        :param prefetch: number of pages requested ahead by a background thread while the current page is consumed.
+                         0 disables read-ahead.
+        :type prefetch: int
+        :rtype: QueryIterator
+        """
+        return QueryIterator(self, page_size=page_size, key=key, cursor=cursor, prefetch=prefetch)
+
+    def to_columns(self, fields, page_size=1000, key='objectId', prefetch=1):
+        """Get the given fields of all objects satisfying this query as NumPy arrays (see `Columns`)
+
+        Pages are requested like `iterate` does, with only the requested keys, and are converted to columns as they
+        arrive. No `Object` is created, which makes this much cheaper than iterating for aggregating many rows.
+
+        >>> import datetime
+        >>> from pyparse import pyparse
+        >>> from pyparse.core import Object
+        >>> from pyparse.core.data.fields import DateTimeField, Field, GeoPointField, NumberField
+        >>> from pyparse.core.data.types import GeoPoint, UTC
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> class Trip(Object):
+        ...     distance = NumberField()
+        ...     start = DateTimeField()
+        ...     origin = GeoPointField()
+        ...     driver = Field()
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> driver = {'__type': 'Pointer', 'className': '_User', 'objectId': 'u1'}
+        >>> Object.save_all([Trip(distance=12.5, start=datetime.datetime(2015, 7, 3, tzinfo=UTC()),
+        ...                       origin=GeoPoint(25.04, 121.53), driver=driver), Trip()])
+        >>> columns = Trip.query().to_columns(['distance', 'start', 'origin', 'driver'])
+        >>> order = columns.masks['distance'].argsort()  # the complete trip first
+        >>> len(columns), columns['distance'][order].tolist(), columns['start'][order].astype(str).tolist()
+        (2, [12.5, nan], ['2015-07-03T00:00:00.000', 'NaT'])
+        >>> columns['origin'][order].tolist(), columns['driver'][order].tolist() == [driver, None]
+        ([[25.04, 121.53], [nan, nan]], True)
+        >>> {name: mask[order].tolist() for name, mask in columns.masks.items()}
+        {'distance': [False, True], 'start': [False, True], 'origin': [False, True], 'driver': [False, True]}
+        >>> float(columns.masked('distance').mean())
+        12.5
+        >>> pyparse.setup_transport(None)
+
+        :param fields: python or parse names of the fields
+        :type fields: list[str]
+        :type page_size: int
+        :type key: str
+        :type prefetch: int
+        :rtype: Columns
+        """
+        # noinspection PyProtectedMember
+        fields_python = self._object_class._fields_python
+        keys = [fields_python[name].parse_name if name in fields_python else name for name in fields]
+        iterator = QueryIterator(self, page_size=page_size, key=key, prefetch=prefetch, keys=keys)
+        return Columns.from_pages(self._object_class, fields, iterator.pages())
+
     def fetch(self):
         assert not self.evaluated, 'A {} object is immutable after evaluated'.format(self.__class__.__name__)
-        contents = request_parse('get', self.request_path, arguments=self.get_arguments())['results']
+        arguments = self.get_arguments()
+        with trace_query(pyparse.slow_query_log, 'fetch', self._class_name, arguments) as trace:
+            contents = self._cached_result('fetch', arguments)
+            if contents is None:
+                contents = request_parse('get', self.request_path, arguments=arguments,
+                                         priority=self._priority)['results']
+                self._cache_result('fetch', arguments, contents)
+            self._did_fetch(contents)
+            trace.rows = len(contents)
+        return self
 
+    async def afetch(self):
+        """Evaluate this query with the asyncio API. Queries can be iterated with `async for` too, which evaluates them
+        this way.
+
+        >>> import asyncio
+        >>> from pyparse import pyparse
+        >>> from pyparse.core import Object
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> async def main():
+        ...     await asyncio.gather(*(Object(class_name='Score', points=i).asave() for i in range(5)))
+        ...     query = Query(class_name='Score').filter(points__gte=2).order_by('-points')
+        ...     return ([score['points'] for score in await query.afetch()],
+        ...             [score['points'] async for score in Query(class_name='Score').filter(points__lt=2)],
+        ...             await Query(class_name='Score').filter(points__gte=2).acount())
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> asyncio.run(main())
+        ([4, 3, 2], [0, 1], 3)
+        >>> pyparse.setup_transport(None)
+
+        :rtype: Query
+        """
+        assert not self.evaluated, 'A {} object is immutable after evaluated'.format(self.__class__.__name__)
+        arguments = self.get_arguments()
+        with trace_query(pyparse.slow_query_log, 'fetch', self._class_name, arguments) as trace:
+            contents = self._cached_result('fetch', arguments)
+            if contents is None:
+                response = await async_request_parse('get', self.request_path, arguments=arguments,
+                                                     priority=self._priority)
+                contents = response['results']
+                self._cache_result('fetch', arguments, contents)
+            self._did_fetch(contents)
+            trace.rows = len(contents)
+        return self
+
+    def _did_fetch(self, contents):
+        """
+        :type contents: list[dict]
+        """
+        # Contents kept by the result cache are shared with the objects, which copy them before they're changed
+        shared = self._result_cache is not None
         if self._object_class:
-            self._contents = [self._object_class.from_parse(content) for content in contents]
+            # noinspection PyProtectedMember
+            self._contents = self._object_class._from_parse_all(contents, loaded_keys=self._keys)
+            # noinspection PyProtectedMember
+            if shared or self._object_class._cache is not None:
+                for obj in self._contents:
+                    if shared:
+                        obj._content_shared = True
+                    if obj._cache is not None:
+                        obj._update_cache()
         else:
-            self._contents = contents
+            self._contents = deepcopy(contents) if shared else contents
 
-        return self
+    async def __aiter__(self):
+        """
+        :rtype: collections.AsyncIterable[pyparse.core.data.object.Object]
+        """
+        if not self.evaluated:
+            await self.afetch()
+        for content in self._contents:
+            yield content
 
     # Annotation/Aggregation
 
@@ -213,4 +505,345 @@ class Query(object):
         :return: the number of all objects which satisfy this query
         :rtype: int
         """
-        return request_parse('get', self.request_path, arguments=self.get_arguments(count='1'))['count']
+        arguments = self.get_arguments(count='1')
+        with trace_query(pyparse.slow_query_log, 'count', self._class_name, arguments) as trace:
+            count = self._cached_result('count', arguments)
+            if count is None:
+                count = request_parse('get', self.request_path, arguments=arguments, priority=self._priority)['count']
+                self._cache_result('count', arguments, count)
+            trace.rows = count
+        return count
+
+    async def acount(self):
+        """
+        Get the number of objects satisfying this query with the asyncio API
+        :rtype: int
+        """
+        arguments = self.get_arguments(count='1')
+        with trace_query(pyparse.slow_query_log, 'count', self._class_name, arguments) as trace:
+            count = self._cached_result('count', arguments)
+            if count is None:
+                response = await async_request_parse('get', self.request_path, arguments=arguments,
+                                                     priority=self._priority)
+                count = response['count']
+                self._cache_result('count', arguments, count)
+            trace.rows = count
+        return count
+
+    # Result cache
+
+    _result_cache = None
+    """:type: LRUCache"""
+
+    @classmethod
+    def enable_result_cache(cls, max_size=1000, ttl=60):
+        """Cache results of `fetch` and `count` by class name and query arguments
+
+        Cached results of a class are dropped when an object of the class is saved or deleted. Use `fresh` to bypass
+        the cache for a single query.
+
+        >>> import time
+        >>> from pyparse import pyparse
+        >>> from pyparse.core import Object
+        >>> from pyparse.fake_server import FakeParseServer
+        >>> pyparse.setup_transport(FakeParseServer())
+        >>> Query.enable_result_cache(ttl=0.1)
+        >>> task = Object(class_name='Task', done=False)
+        >>> task.save()
+        >>> Query(class_name='Task').count()
+        1
+        >>> _ = request_parse('post', 'classes/Task', arguments={'done': True})  # by another client
+        >>> Query(class_name='Task').count(), Query(class_name='Task').fresh().count()
+        (1, 2)
+        >>> Object.save_all([Object(class_name='Task', done=True)])
+        >>> Query(class_name='Task').count()
+        3
+        >>> for _ in range(2):
+        ...     _ = request_parse('post', 'classes/Task', arguments={'done': True})
+        >>> task.delete()
+        >>> Query(class_name='Task').count()
+        4
+        >>> _ = request_parse('post', 'classes/Task', arguments={'done': True})
+        >>> Query(class_name='Task').count()
+        4
+        >>> time.sleep(0.15)
+        >>> Query(class_name='Task').count()
+        5
+        >>> Query.disable_result_cache()
+        >>> pyparse.setup_transport(None)
+
+        :param max_size: max number of cached results. Least recently used ones are evicted first.
+        :type max_size: int
+        :param ttl: seconds before a cached result expires, or None to keep it until it's evicted or invalidated
+        :type ttl: float | None
+        """
+        cls._result_cache = LRUCache(max_size=max_size, ttl=ttl)
+
+    @classmethod
+    def disable_result_cache(cls):
+        cls._result_cache = None
+
+    @classmethod
+    def result_cache_stats(cls):
+        """
+        :return: hits, misses, evictions and size of the result cache, or None if it's disabled
+        :rtype: dict[str, int] | None
+        """
+        return cls._result_cache.stats if cls._result_cache is not None else None
+
+    @classmethod
+    def invalidate_result_cache(cls, class_name):
+        """Drop all cached results of a Parse class
+
+        :type class_name: str
+        """
+        if cls._result_cache is not None:
+            cls._result_cache.discard_where(lambda key: key[0] == class_name)
+
+    def _result_cache_key(self, kind, arguments):
+        """
+        >>> q1 = Query(class_name='TestClass').filter(a=1, b=2).limit(10)
+        >>> q2 = Query(class_name='TestClass').limit(10).filter(b=2).filter(a=1)
+        >>> q1._result_cache_key('fetch', q1.get_arguments()) == q2._result_cache_key('fetch', q2.get_arguments())
+        True
+
+        :type kind: str
+        :type arguments: dict
+        :rtype: tuple
+        """
+        return (self._class_name, kind) + tuple(sorted(arguments.items()))
+
+    def _cached_result(self, kind, arguments):
+        if self._result_cache is None or not self._use_result_cache:
+            return None
+        return self._result_cache.get(self._result_cache_key(kind, arguments))
+
+    def _cache_result(self, kind, arguments, result):
+        if self._result_cache is not None:
+            self._result_cache.set(self._result_cache_key(kind, arguments), result)
+
+
+class QueryIterator(object):
+    """Keyset-paginated iterator over the results of a `Query`. Created by `Query.iterate`."""
+
+    _keys = ('objectId', 'createdAt')
+
+    def __init__(self, query, page_size=100, key='objectId', cursor=None, prefetch=0, keys=None):
+        """
+        :type query: Query
+        :type page_size: int
+        :type key: str
+        :type cursor: str
+        :type prefetch: int
+        :param keys: parse names of the only fields requested, or None to request all of them
+        :type keys: list[str] | None
+        """
+        # noinspection PyProtectedMember
+        assert not query._order_list, 'An iterated query is ordered by its key. Remove order_by from it.'
+        assert 'skip' not in query._arguments, 'An iterated query is paged by its key. Remove offset from it.'
+        assert isinstance(page_size, int) and 1 <= page_size <= 1000, \
+            'page_size should be an integer between 1 and 1,000'
+
+        # noinspection PyProtectedMember
+        field = query._object_class._fields_python.get(key, None)
+        key = field.parse_name if field else key
+        assert key in self._keys, 'key should be one of {}'.format(', '.join(self._keys))
+        assert isinstance(prefetch, int) and prefetch >= 0, 'prefetch should be a non-negative integer'
+
+        self._query = query
+        """:type: Query"""
+        self._page_size = page_size
+        """:type: int"""
+        self._key = key
+        """:type: str"""
+        self._prefetch = prefetch
+        """:type: int"""
+        # noinspection PyProtectedMember
+        self._limit = query._arguments.get('limit', None)
+        """Max number of objects of the scan
+
+        :type: int | None"""
+        # noinspection PyProtectedMember
+        loaded_keys = frozenset(keys) | {key, 'objectId'} if keys is not None else query._keys
+        self._loaded_keys = loaded_keys
+        """:type: frozenset[str] | None"""
+        self._keys_argument = ','.join(sorted(loaded_keys)) if loaded_keys is not None else None
+        """:type: str | None"""
+
+        self._after = None
+        """:type: (str, str) | None"""
+        if cursor:
+            cursor_key, *self._after = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            assert cursor_key == key, 'This cursor was created by iterating on {}'.format(cursor_key)
+
+    @property
+    def cursor(self):
+        """A token which resumes the scan right after the last yielded object, or None if nothing was yielded yet
+
+        :rtype: str | None
+        """
+        if self._after is None:
+            return None
+        token = json.dumps([self._key] + list(self._after), separators=(',', ':'))
+        return base64.urlsafe_b64encode(token.encode()).decode()
+
+    def __iter__(self):
+        """
+        :rtype: collections.Iterator[pyparse.core.data.object.Object]
+        """
+        # noinspection PyProtectedMember
+        object_class = self._query._object_class
+        for page in (self._prefetched_pages() if self._prefetch else self._pages()):
+            # noinspection PyProtectedMember
+            for content, obj in zip(page, object_class._from_parse_all(page, loaded_keys=self._loaded_keys)):
+                self._after = (content[self._key], content['objectId'])
+                yield obj
+
+    def pages(self):
+        """Iterate over pages of objects in Parse's representation instead of over objects
+
+        :rtype: collections.Iterator[list[dict]]
+        """
+        for page in (self._prefetched_pages() if self._prefetch else self._pages()):
+            if page:
+                self._after = (page[-1][self._key], page[-1]['objectId'])
+            yield page
+
+    def _pages(self):
+        """
+        :rtype: collections.Iterator[list[dict]]
+        """
+        after = self._after
+        remaining = self._limit
+        while True:
+            page_size = self._page_size if remaining is None else min(self._page_size, remaining)
+            page = self._fetch_page(after, page_size)
+            yield page
+            if len(page) < page_size:
+                return
+            if remaining is not None:
+                remaining -= len(page)
+                if not remaining:
+                    return
+            after = (page[-1][self._key], page[-1]['objectId'])
+
+    def _prefetched_pages(self):
+        """Same as `_pages`, but pages are requested by a worker thread which stays up to `prefetch` pages ahead.
+
+        Keyset pages depend on the previous one, so pages are still requested one by one. Closing this generator
+        (e.g. the consumer breaks out of its loop) stops the worker; a page already in flight is discarded.
+
+        :rtype: collections.Iterator[list[dict]]
+        """
+        pages = queue.Queue(maxsize=self._prefetch)
+        stopped = threading.Event()
+
+        def put(item):
+            # Block while the buffer is full, but give up as soon as the consumer is gone
+            while not stopped.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                except queue.Full:
+                    continue
+                return True
+            return False
+
+        def fetch_pages():
+            try:
+                for page in self._pages():
+                    if not put(page):
+                        return
+            except Exception as e:
+                put(e)
+            else:
+                put(None)
+
+        # Run the worker in the context of the consumer, so it sends requests with the same priority
+        worker = threading.Thread(target=copy_context().run, args=(fetch_pages,), name='pyparse-query-prefetch',
+                                  daemon=True)
+        worker.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is None:
+                    return
+                elif isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            stopped.set()
+
+    def _fetch_page(self, after, page_size):
+        """
+        :param after: raw value of `key` and object id of the last object of the previous page
+        :type after: (str, str) | None
+        :type page_size: int
+        :rtype: list[dict]
+        """
+        # noinspection PyProtectedMember
+        return request_parse('get', self._query.request_path, arguments=self._page_arguments(after, page_size),
+                             priority=self._query._priority)['results']
+
+    def _page_arguments(self, after, page_size):
+        """
+        >>> query = Query(class_name='Item').filter(**{'$or': [{'n': 1}, {'n': 2}]})
+        >>> where = json.loads(query.iterate(key='createdAt')._page_arguments(('2015-07-03T04:05:06.789Z', 'a'),
+        ...                                                                   10)['where'])
+        >>> where['$and'][0]
+        {'$or': [{'n': 1}, {'n': 2}]}
+
+        :type after: (str, str) | None
+        :type page_size: int
+        :rtype: dict
+        """
+        # noinspection PyProtectedMember
+        where = deepcopy(self._query._where_dict)
+        if self._key == 'objectId':
+            order = 'objectId'
+            if after:
+                self._constrain_greater_than(where, 'objectId', after[1])
+        else:
+            order = '{},objectId'.format(self._key)
+            if after:
+                key_value = {'__type': 'Date', 'iso': after[0]}
+                after_condition = {'$or': [
+                    {self._key: {'$gt': key_value}},
+                    {self._key: key_value, 'objectId': {'$gt': after[1]}},
+                ]}
+                if '$or' in where:
+                    # Both conditions have to be satisfied
+                    where = {'$and': [where, after_condition]}
+                else:
+                    where.update(after_condition)
+
+        arguments = self._query.get_arguments(order=order, limit=page_size)
+        if self._keys_argument:
+            arguments['keys'] = self._keys_argument
+        if where:
+            arguments['where'] = json.dumps(where, separators=(',', ':'))
+        return arguments
+
+    @staticmethod
+    def _constrain_greater_than(where, key, value):
+        """Add `key > value` to the where dict of a query without dropping existing constraints of `key`
+
+        >>> where = {'objectId': {'$gt': 'b'}}
+        >>> QueryIterator._constrain_greater_than(where, 'objectId', 'a')
+        >>> where
+        {'objectId': {'$gt': 'b'}}
+        >>> where = {'objectId': 'c'}
+        >>> QueryIterator._constrain_greater_than(where, 'objectId', 'a')
+        >>> where
+        {'objectId': {'$in': ['c'], '$gt': 'a'}}
+
+        :type where: dict
+        :type key: str
+        :type value: str
+        """
+        constraint = where.get(key, None)
+        if constraint is None:
+            where[key] = {'$gt': value}
+        elif not isinstance(constraint, dict):
+            where[key] = {'$in': [constraint], '$gt': value}
+        elif '$gt' not in constraint or constraint['$gt'] < value:
+            constraint['$gt'] = value
@@ -15,6 +15,9 @@
 #
 
 import datetime
+import re
+
+from pyparse.utils.lang import SingletonBase
 
 _registered_parse_convertible_types = {}
 
@@ -110,7 +113,7 @@ class GeoPoint(ParseConvertible):
 
 # == datetime ==========================================================================================================
 
-class UTC(datetime.tzinfo):
+class UTC(datetime.tzinfo, metaclass=SingletonBase):
 
     @staticmethod
     def utcoffset(*args, **kwargs):
@@ -131,7 +134,7 @@ class UTC(datetime.tzinfo):
         return self.tzname()
 
 
-class LocalTimezone(datetime.tzinfo):
+class LocalTimezone(datetime.tzinfo, metaclass=SingletonBase):
 
     @staticmethod
     def utcoffset(*args, **kwargs):
@@ -153,22 +156,83 @@ class LocalTimezone(datetime.tzinfo):
         return self.tzname()
 
 
+_utc = UTC()
+_local_timezone = LocalTimezone()
+
+_parse_datetime_pattern = re.compile(r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)\.(\d{3})Z\Z', re.ASCII)
+_parse_datetime_format = '%Y-%m-%dT%H:%M:%S.%fZ'
+
+
 def datetime_to_parse_str(datetime_obj):
     """
+    >>> datetime_to_parse_str(datetime.datetime(2015, 7, 3, 12, 34, 56, 789999, tzinfo=UTC()))
+    '2015-07-03T12:34:56.789Z'
+    >>> tz = datetime.timezone(datetime.timedelta(hours=8))
+    >>> datetime_to_parse_str(datetime.datetime(2015, 7, 3, 8, 0, 0, tzinfo=tz))
+    '2015-07-03T00:00:00.000Z'
+
     :type datetime_obj: datetime.datetime
     :rtype: str
     """
-    if not datetime_obj.tzinfo:
-        datetime_obj = datetime_obj.replace(tzinfo=LocalTimezone())
-    return datetime_obj.astimezone(UTC()).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]+'Z'
+    tzinfo = datetime_obj.tzinfo
+    if not tzinfo:
+        datetime_obj = datetime_obj.replace(tzinfo=_local_timezone)
+    if tzinfo is not _utc:
+        datetime_obj = datetime_obj.astimezone(_utc)
+    if datetime_obj.year < 1000:
+        # strftime doesn't pad years on every platform. Keep its behavior.
+        return datetime_obj.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]+'Z'
+    return '%04d-%02d-%02dT%02d:%02d:%02d.%03dZ' % (datetime_obj.year, datetime_obj.month, datetime_obj.day,
+                                                   datetime_obj.hour, datetime_obj.minute, datetime_obj.second,
+                                                   datetime_obj.microsecond // 1000)
 
 
 def datetime_str_to_python(parse_str):
     """
+    >>> datetime_str_to_python('2015-07-03T12:34:56.789Z')
+    datetime.datetime(2015, 7, 3, 12, 34, 56, 789000, tzinfo=UTC)
+    >>> datetime_str_to_python('2015-07-03T12:34:56.7Z')
+    datetime.datetime(2015, 7, 3, 12, 34, 56, 700000, tzinfo=UTC)
+
     :type parse_str: str
     :rtype: datetime.datetime
     """
-    return datetime.datetime.strptime(parse_str, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=UTC())
+    match = _parse_datetime_pattern.match(parse_str)
+    if match:
+        year, month, day, hour, minute, second, millisecond = map(int, match.groups())
+        return datetime.datetime(year, month, day, hour, minute, second, millisecond * 1000, _utc)
+    # Not the format Parse uses. Fall back to strptime, which is more lenient.
+    return datetime.datetime.strptime(parse_str, _parse_datetime_format).replace(tzinfo=_utc)
+
+
+def datetime_strs_to_python(parse_strs):
+    """Convert many Parse datetime strings at once
+
+    >>> datetime_strs_to_python(['2015-07-03T00:00:00.000Z', '2015-07-04T00:00:00.000Z'])[1]
+    datetime.datetime(2015, 7, 4, 0, 0, tzinfo=UTC)
+
+    :type parse_strs: collections.Iterable[str]
+    :rtype: list[datetime.datetime]
+    """
+    match, new_datetime, utc = _parse_datetime_pattern.match, datetime.datetime, _utc
+    results = []
+    for parse_str in parse_strs:
+        m = match(parse_str)
+        if m:
+            year, month, day, hour, minute, second, millisecond = map(int, m.groups())
+            results.append(new_datetime(year, month, day, hour, minute, second, millisecond * 1000, utc))
+        else:
+            results.append(datetime_str_to_python(parse_str))
+    return results
+
+
+def datetimes_to_parse_strs(datetime_objs):
+    """Convert many datetime objects to Parse datetime strings at once
+
+    :type datetime_objs: collections.Iterable[datetime.datetime]
+    :rtype: list[str]
+    """
+    return [datetime_to_parse_str(datetime_obj) for datetime_obj in datetime_objs]
 
 
 def datetime_to_parse_dict(datetime_obj):
@@ -31,3 +31,35 @@ class ParseError(Exception):
 
 class ParseInternalServerError(ParseError):
     pass
+
+
+class ParseRateLimitError(ParseError):
+    pass
+
+
+class ParseBatchError(ParseError):
+
+    def __init__(self, errors):
+        """
+        :param errors: objects which failed in batch requests, paired with the error Parse reported for each of them,
+                       or the error of their whole batch request (e.g. `ConnectionError` if it got no response)
+        :type errors: list[(object, Exception)]
+        """
+        reason = '{} of the batch operations failed'.format(len(errors))
+        codes = [error.code for _, error in errors if isinstance(error, ParseError)]
+        super(ParseBatchError, self).__init__(codes[0] if codes else None, reason)
+        self.errors = errors
+        """:type: list[(object, Exception)]"""
+
+    @property
+    def objects(self):
+        """
+        :return: the objects which failed
+        :rtype: list[object]
+        """
+        return [obj for obj, _ in self.errors]
+
+
+class UnloadedFieldError(KeyError):
+    """A field left out by `Query.only` or `Query.defer` was read, and the class doesn't fetch deferred fields"""
+    pass
@@ -0,0 +1,373 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from copy import deepcopy
+import datetime
+import json
+import math
+import random
+import string
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from pyparse.transport import Transport
+
+
+class _ParseServerError(Exception):
+
+    def __init__(self, status_code, code, error):
+        super(_ParseServerError, self).__init__(error)
+        self.status_code = status_code
+        self.code = code
+        self.error = error
+
+
+def _now():
+    """
+    :return: the current time in Parse's format
+    :rtype: str
+    """
+    now = datetime.datetime.utcnow()
+    return '%04d-%02d-%02dT%02d:%02d:%02d.%03dZ' % (now.year, now.month, now.day, now.hour, now.minute, now.second,
+                                                   now.microsecond // 1000)
+
+
+def _comparable(value):
+    """Value used to compare and sort values of Parse's representation"""
+    if isinstance(value, dict):
+        if value.get('__type', None) == 'Date':
+            return value['iso']
+        elif value.get('__type', None) == 'Pointer':
+            return value['objectId']
+    return value
+
+
+def _sort_key(value):
+    value = _comparable(value)
+    return (value is not None, value if value is not None else 0)
+
+
+def _radians_between(geo_point, another_geo_point):
+    lat1, lng1 = math.radians(geo_point['latitude']), math.radians(geo_point['longitude'])
+    lat2, lng2 = math.radians(another_geo_point['latitude']), math.radians(another_geo_point['longitude'])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * math.asin(min(1.0, math.sqrt(a)))
+
+
+# Radians per unit of $maxDistance operators
+_max_distance_operators = {
+    '$maxDistance': 1.0, '$maxDistanceInRadians': 1.0,
+    '$maxDistanceInMiles': 1 / 3958.8,
+    '$maxDistanceInKilometers': 1 / 6371.0,
+}
+
+
+class FakeParseServer(Transport):
+    """
+    An in-memory stand-in for a Parse server, used as a transport (see `pyparse.setup_transport`). It runs tests and
+    throughput measurements without any network, so what's measured is the overhead of the client itself.
+
+    It implements CRUD and queries (with the operators of `Query.filter`, `$or`, order, limit, skip, keys and count) of
+    classes, batch requests, config, cloud functions and jobs, and analytics events. Data is kept in Parse's
+    representation.
+
+    >>> server = FakeParseServer()
+    >>> status, headers, body = server.request('post', 'https://api.parse.com/1/classes/City', data='{"n":1}')
+    >>> status
+    201
+    >>> created = json.loads(body)
+    >>> status, headers, body = server.request('get', 'https://api.parse.com/1/classes/City',
+    ...                                        params={'where': '{"n":{"$gte":1}}', 'count': 1})
+    >>> response = json.loads(body)
+    >>> response['count'], response['results'][0]['objectId'] == created['objectId']
+    (1, True)
+    """
+
+    def __init__(self, mount_path='/1', latency=0):
+        """
+        :param mount_path: path of the server in request URLs
+        :type mount_path: str
+        :param latency: seconds slept before answering each request, to simulate a network
+        :type latency: float
+        """
+        self._mount_path = mount_path.rstrip('/')
+        """:type: str"""
+        self._latency = latency
+        """:type: float"""
+
+        self._classes = {}
+        """:type: dict[str, dict[str, dict]]"""
+        self._lock = threading.RLock()
+
+        self.config = {}
+        """Config parameters
+
+        :type: dict"""
+        self.functions = {}
+        """Cloud functions by name, called with the parameters of a request as keyword arguments
+
+        :type: dict[str, collections.Callable]"""
+        self.jobs = {}
+        """Background jobs by name, called with the parameters of a request as keyword arguments
+
+        :type: dict[str, collections.Callable]"""
+        self.events = []
+        """(name, body) of tracked analytics events
+
+        :type: list[(str, dict)]"""
+        self.request_count = 0
+        """:type: int"""
+
+    def objects(self, class_name):
+        """
+        :return: copies of the objects of a class in Parse's representation
+        :rtype: list[dict]
+        """
+        with self._lock:
+            return deepcopy(list(self._classes.get(class_name, {}).values()))
+
+    # Transport
+
+    def request(self, verb, url, params=None, data=None, headers=None):
+        """
+        :rtype: (int, dict[str, str], bytes)
+        """
+        if self._latency:
+            time.sleep(self._latency)
+
+        scheme, host, path, query, _ = urlsplit(url)
+        params = dict(params or {}, **dict(parse_qsl(query)))
+        body = json.loads(data) if data else {}
+        with self._lock:
+            self.request_count += 1
+            try:
+                status_code, response_dict = self._route(verb.lower(), path, params, body)
+            except _ParseServerError as e:
+                status_code, response_dict = e.status_code, {'code': e.code, 'error': e.error}
+            # Serialized like the response of a real server, so decoding it is measured too
+            return status_code, {}, json.dumps(response_dict, separators=(',', ':')).encode()
+
+    async def arequest(self, verb, url, params=None, data=None, headers=None):
+        return self.request(verb, url, params=params, data=data, headers=headers)
+
+    def _route(self, verb, path, params, body):
+        """
+        :return: status code and response
+        :rtype: (int, dict)
+        """
+        if not path.startswith(self._mount_path + '/'):
+            raise _ParseServerError(404, 1, 'unknown path {}'.format(path))
+        resource, *components = path[len(self._mount_path) + 1:].strip('/').split('/')
+
+        if resource == 'classes' and len(components) == 1:
+            if verb == 'get':
+                return 200, self._find(components[0], params)
+            elif verb == 'post':
+                return 201, self._create(components[0], body)
+        elif resource == 'classes' and len(components) == 2:
+            if verb == 'get':
+                return 200, self._get(*components)
+            elif verb == 'put':
+                return 200, self._update(components[0], components[1], body)
+            elif verb == 'delete':
+                return 200, self._delete(*components)
+        elif resource == 'batch' and not components and verb == 'post':
+            return 200, self._batch(body)
+        elif resource == 'config' and not components and verb == 'get':
+            return 200, {'params': self.config}
+        elif resource in ('functions', 'jobs') and len(components) == 1 and verb == 'post':
+            registry = self.functions if resource == 'functions' else self.jobs
+            if components[0] not in registry:
+                raise _ParseServerError(400, 141, 'Invalid function: "{}"'.format(components[0]))
+            result = registry[components[0]](**body)
+            return 200, {'result': result} if resource == 'functions' else {}
+        elif resource == 'events' and len(components) == 1 and verb == 'post':
+            self.events.append((components[0], body))
+            return 200, {}
+        raise _ParseServerError(404, 1, 'unknown route {} {}'.format(verb.upper(), path))
+
+    # Objects
+
+    def _stored(self, class_name, object_id):
+        """
+        :rtype: dict
+        """
+        obj = self._classes.get(class_name, {}).get(object_id, None)
+        if obj is None:
+            raise _ParseServerError(404, 101, 'object not found for {}'.format(object_id))
+        return obj
+
+    def _create(self, class_name, body):
+        objects = self._classes.setdefault(class_name, {})
+        object_id = ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(10))
+        while object_id in objects:
+            object_id = ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(10))
+        now = _now()
+        obj = {'objectId': object_id, 'createdAt': now, 'updatedAt': now}
+        self._apply(obj, body)
+        objects[object_id] = obj
+        return {'objectId': object_id, 'createdAt': now}
+
+    def _get(self, class_name, object_id):
+        return self._stored(class_name, object_id)
+
+    def _update(self, class_name, object_id, body):
+        obj = self._stored(class_name, object_id)
+        response = self._apply(obj, body)
+        obj['updatedAt'] = response['updatedAt'] = _now()
+        return response
+
+    def _delete(self, class_name, object_id):
+        self._stored(class_name, object_id)
+        del self._classes[class_name][object_id]
+        return {}
+
+    @staticmethod
+    def _apply(obj, body):
+        """Apply the body of a create/update request to a stored object
+
+        :return: values of keys changed by operations, which Parse returns in the response of an update
+        :rtype: dict
+        """
+        changed = {}
+        for key, value in body.items():
+            if key in ('objectId', 'createdAt', 'updatedAt'):
+                raise _ParseServerError(400, 105, 'Invalid field name: {}.'.format(key))
+            operation = value.get('__op', None) if isinstance(value, dict) else None
+            if operation is None:
+                obj[key] = value
+            elif operation == 'Delete':
+                obj.pop(key, None)
+            elif operation == 'Increment':
+                obj[key] = changed[key] = obj.get(key, 0) + value['amount']
+            elif operation == 'Add':
+                obj[key] = changed[key] = obj.get(key, []) + value['objects']
+            elif operation == 'AddUnique':
+                current = obj.get(key, [])
+                obj[key] = changed[key] = current + [o for o in value['objects'] if o not in current]
+            elif operation == 'Remove':
+                obj[key] = changed[key] = [o for o in obj.get(key, []) if o not in value['objects']]
+            else:
+                raise _ParseServerError(400, 102, 'Unsupported operation: {}'.format(operation))
+        return changed
+
+    # Queries
+
+    def _find(self, class_name, params):
+        where = params.get('where', None)
+        where = json.loads(where) if isinstance(where, str) else where or {}
+        results = [obj for obj in self._classes.get(class_name, {}).values() if self._matches(obj, where)]
+
+        response = {}
+        if str(params.get('count', '')) == '1':
+            response['count'] = len(results)
+
+        for order_key in reversed([k for k in params.get('order', '').split(',') if k]):
+            descending = order_key.startswith('-')
+            order_key = order_key.lstrip('-')
+            results.sort(key=lambda obj: _sort_key(obj.get(order_key, None)), reverse=descending)
+
+        skip = int(params.get('skip', 0))
+        limit = int(params.get('limit', 100))
+        results = results[skip:skip + limit]
+
+        if params.get('keys', None):
+            keys = set(params['keys'].split(',')) | {'objectId', 'createdAt', 'updatedAt'}
+            results = [{key: value for key, value in obj.items() if key in keys} for obj in results]
+
+        response['results'] = results
+        return response
+
+    def _matches(self, obj, where):
+        """
+        :type obj: dict
+        :type where: dict
+        :rtype: bool
+        """
+        for key, constraint in where.items():
+            if key == '$or':
+                if not any(self._matches(obj, sub_where) for sub_where in constraint):
+                    return False
+            elif key == '$and':
+                if not all(self._matches(obj, sub_where) for sub_where in constraint):
+                    return False
+            elif isinstance(constraint, dict) and '__type' not in constraint:
+                for operator, operand in constraint.items():
+                    if not self._satisfies(obj, key, operator, operand, constraint):
+                        return False
+            elif not self._equals(obj.get(key, None), constraint):
+                return False
+        return True
+
+    @staticmethod
+    def _equals(value, operand):
+        if isinstance(value, list) and not isinstance(operand, list):
+            # Equality on an array matches arrays containing the value
+            return any(_comparable(v) == _comparable(operand) for v in value)
+        return _comparable(value) == _comparable(operand)
+
+    def _satisfies(self, obj, key, operator, operand, constraint):
+        value = obj.get(key, None)
+        if operator in ('$lt', '$lte', '$gt', '$gte'):
+            if value is None:
+                return False
+            value, operand = _comparable(value), _comparable(operand)
+            try:
+                return {'$lt': value < operand, '$lte': value <= operand,
+                        '$gt': value > operand, '$gte': value >= operand}[operator]
+            except TypeError:
+                return False
+        elif operator == '$ne':
+            return not self._equals(value, operand)
+        elif operator == '$in':
+            return any(self._equals(value, o) for o in operand)
+        elif operator == '$nin':
+            return not any(self._equals(value, o) for o in operand)
+        elif operator == '$exists':
+            return (key in obj) == bool(operand)
+        elif operator == '$all':
+            return isinstance(value, list) and all(self._equals(value, o) for o in operand)
+        elif operator in ('$select', '$dontSelect'):
+            sub_query = operand['query']
+            selected = [_comparable(o.get(operand['key'], None))
+                        for o in self._find(sub_query['className'], {'where': sub_query.get('where', {}),
+                                                                     'limit': 1000000})['results']]
+            return (_comparable(value) in selected) == (operator == '$select')
+        elif operator == '$nearSphere':
+            if not isinstance(value, dict) or value.get('__type', None) != 'GeoPoint':
+                return False
+            distance = _radians_between(value, operand)
+            for max_operator, radians_per_unit in _max_distance_operators.items():
+                if max_operator in constraint and distance > constraint[max_operator] * radians_per_unit:
+                    return False
+            return True
+        elif operator in _max_distance_operators:
+            return True  # Checked with $nearSphere
+        raise _ParseServerError(400, 102, 'Invalid query operator: {}'.format(operator))
+
+    # Batch
+
+    def _batch(self, body):
+        results = []
+        for request in body.get('requests', []):
+            try:
+                status_code, response = self._route(request['method'].lower(), request['path'], {},
+                                                    request.get('body', None) or {})
+                results.append({'success': response})
+            except _ParseServerError as e:
+                results.append({'error': {'code': e.code, 'error': e.error}})
+        return results
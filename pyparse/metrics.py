@@ -0,0 +1,349 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import bisect
+import re
+import threading
+import time
+from urllib.parse import urlencode
+
+request_hooks = []
+"""Functions called with a `RequestInfo` after every HTTP request to Parse (including each retry). Use
+`add_request_hook` and `remove_request_hook` to change it.
+
+:type: list[collections.Callable]"""
+
+conversion_hooks = []
+"""Functions called with the step (e.g. 'from_parse'), class name, number of objects and seconds spent after objects
+returned by Parse are converted. Use `add_conversion_hook` and `remove_conversion_hook` to change it.
+
+:type: list[collections.Callable]"""
+
+_hooks_lock = threading.Lock()
+
+
+def _add_hook(hooks_name, hook):
+    # Hook lists are replaced instead of changed, so they can be iterated without a lock
+    with _hooks_lock:
+        globals()[hooks_name] = globals()[hooks_name] + [hook]
+
+
+def _remove_hook(hooks_name, hook):
+    with _hooks_lock:
+        globals()[hooks_name] = [h for h in globals()[hooks_name] if h != hook]
+
+
+def add_request_hook(hook):
+    """
+    :param hook: called with a `RequestInfo`
+    :type hook: collections.Callable
+    """
+    _add_hook('request_hooks', hook)
+
+
+def remove_request_hook(hook):
+    _remove_hook('request_hooks', hook)
+
+
+def add_conversion_hook(hook):
+    """
+    :param hook: called with the step, class name, number of objects and seconds spent
+    :type hook: collections.Callable
+    """
+    _add_hook('conversion_hooks', hook)
+
+
+def remove_conversion_hook(hook):
+    _remove_hook('conversion_hooks', hook)
+
+
+_path_templates = [
+    (re.compile(r'^classes/[^/]+/[^/]+$'), 'classes/{className}/{objectId}'),
+    (re.compile(r'^classes/[^/]+$'), 'classes/{className}'),
+    (re.compile(r'^(users|installations|roles|sessions)/[^/]+$'), r'\1/{objectId}'),
+    (re.compile(r'^functions/[^/]+$'), 'functions/{functionName}'),
+    (re.compile(r'^jobs/[^/]+$'), 'jobs/{jobName}'),
+    (re.compile(r'^events/[^/]+$'), 'events/{eventName}'),
+]
+
+
+def path_template(path):
+    """Group request paths by endpoint
+
+    >>> path_template('/classes/City/a1b2c3')
+    'classes/{className}/{objectId}'
+    >>> path_template('functions/hello')
+    'functions/{functionName}'
+    >>> path_template('batch')
+    'batch'
+
+    :type path: str
+    :rtype: str
+    """
+    path = path.strip('/')
+    for pattern, template in _path_templates:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return path
+
+
+class RequestInfo(object):
+    """What a request to Parse did on the wire. Passed to request hooks."""
+
+    __slots__ = ('verb', 'path', 'path_template', 'attempt', 'status_code', 'error', 'network_time', 'decode_time',
+                 'request_bytes', 'response_bytes', '_started_at', '_received_at')
+
+    def __init__(self, verb, path, attempt=0, params=None, data=None):
+        """Start timing a request
+
+        >>> RequestInfo('post', 'classes/City', data='{"name":"台北"}', params={'count': 1}).request_bytes
+        24
+
+        :type verb: str
+        :param path: path of the request, without the API version
+        :type path: str
+        :param attempt: number of retries done before this request
+        :type attempt: int
+        :type params: dict
+        :type data: str | bytes
+        """
+        self.verb = verb
+        """:type: str"""
+        self.path = path.strip('/')
+        """:type: str"""
+        self.path_template = path_template(path)
+        """:type: str"""
+        self.attempt = attempt
+        """:type: int"""
+        self.status_code = None
+        """:type: int | None"""
+        self.error = None
+        """Error raised by the transport (e.g. `ConnectionError`), if no response was received
+
+        :type: Exception | None"""
+        self.network_time = None
+        """Seconds from sending the request to receiving the whole response body
+
+        :type: float | None"""
+        self.decode_time = None
+        """Seconds spent decoding the JSON body of the response
+
+        :type: float | None"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.request_bytes = (len(data) if data else 0) + (len(urlencode(params)) if params else 0)
+        """Size of the body and the query string of the request
+
+        :type: int"""
+        self.response_bytes = None
+        """:type: int | None"""
+        self._started_at = time.perf_counter()
+        self._received_at = None
+
+    def received(self, status_code, body):
+        self._received_at = time.perf_counter()
+        self.network_time = self._received_at - self._started_at
+        self.status_code = status_code
+        self.response_bytes = len(body) if body else 0
+
+    def decoded(self):
+        self.decode_time = time.perf_counter() - self._received_at
+        report_request(self)
+
+    def failed(self, error):
+        self.network_time = time.perf_counter() - self._started_at
+        self.error = error
+        report_request(self)
+
+    def as_dict(self):
+        """
+        :rtype: dict
+        """
+        return {key: getattr(self, key) for key in self.__slots__ if not key.startswith('_')}
+
+
+def report_request(info):
+    """
+    :type info: RequestInfo
+    """
+    for hook in request_hooks:
+        hook(info)
+
+
+def report_conversion(step, class_name, count, seconds):
+    """
+    :type step: str
+    :type class_name: str
+    :type count: int
+    :type seconds: float
+    """
+    for hook in conversion_hooks:
+        hook(step, class_name, count, seconds)
+
+
+# == Metrics registry ==================================================================================================
+
+class Counter(object):
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram(object):
+    """
+    Count of observed values per bucket (by upper bound), with their sum.
+
+    >>> histogram = Histogram(buckets=(0.1, 1))
+    >>> for value in (0.05, 0.5, 5):
+    ...     histogram.observe(value)
+    >>> histogram.snapshot() == {'count': 3, 'sum': 5.55, 'buckets': {0.1: 1, 1: 2, float('inf'): 3}}
+    True
+    """
+
+    default_buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    """Upper bounds of latency buckets, in seconds"""
+
+    def __init__(self, buckets=None):
+        """
+        :param buckets: upper bounds of the buckets, in ascending order. A bucket of infinity is added.
+        :type buckets: collections.Sequence[float]
+        """
+        self._bounds = tuple(buckets or self.default_buckets)
+        """:type: tuple[float]"""
+        self._counts = [0] * (len(self._bounds) + 1)
+        """:type: list[int]"""
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self):
+        """
+        :return: count, sum and cumulative count of each bucket
+        :rtype: dict
+        """
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        buckets, cumulative = {}, 0
+        for bound, count in zip(self._bounds + (float('inf'),), counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {'count': cumulative, 'sum': round(total, 9), 'buckets': buckets}
+
+
+class MetricsRegistry(object):
+    """
+    In-process counters and histograms, keyed by name and labels. `enable` makes it record requests and conversions
+    of pyparse through hooks.
+
+    >>> registry = MetricsRegistry()
+    >>> registry.counter('jobs', kind='import').inc()
+    >>> registry.snapshot()['counters']
+    {'jobs': {'kind=import': 1}}
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        """:type: dict[(type, str, tuple), Counter | Histogram]"""
+        self._lock = threading.Lock()
+
+    def _metric(self, metric_class, name, labels, **kwargs):
+        key = (metric_class, name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key, None)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(key, metric_class(**kwargs))
+        return metric
+
+    def counter(self, name, **labels):
+        """
+        :rtype: Counter
+        """
+        return self._metric(Counter, name, labels)
+
+    def histogram(self, name, buckets=None, **labels):
+        """
+        :param buckets: upper bounds of buckets, used when the histogram is created
+        :type buckets: collections.Sequence[float]
+        :rtype: Histogram
+        """
+        return self._metric(Histogram, name, labels, buckets=buckets)
+
+    def snapshot(self):
+        """
+        :return: values of counters and histograms by name and labels (as 'key=value,...' strings)
+        :rtype: dict[str, dict[str, dict]]
+        """
+        snapshot = {'counters': {}, 'histograms': {}}
+        with self._lock:
+            metrics = list(self._metrics.items())
+        for (metric_class, name, labels), metric in metrics:
+            kind = 'counters' if metric_class is Counter else 'histograms'
+            labels = ','.join('{}={}'.format(key, value) for key, value in labels)
+            snapshot[kind].setdefault(name, {})[labels] = metric.snapshot()
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._metrics.clear()
+
+    # Hooks
+
+    def record_request(self, info):
+        """
+        :type info: RequestInfo
+        """
+        status = info.status_code if info.error is None else type(info.error).__name__
+        self.counter('pyparse_requests_total', verb=info.verb, path=info.path_template, status=status).inc()
+        if info.attempt:
+            self.counter('pyparse_retries_total', verb=info.verb, path=info.path_template).inc()
+        self.counter('pyparse_request_bytes_total', verb=info.verb, path=info.path_template).inc(info.request_bytes)
+        self.histogram('pyparse_request_network_seconds', verb=info.verb,
+                       path=info.path_template).observe(info.network_time)
+        if info.error is None:
+            self.counter('pyparse_response_bytes_total', verb=info.verb,
+                         path=info.path_template).inc(info.response_bytes)
+            self.histogram('pyparse_response_decode_seconds', verb=info.verb,
+                           path=info.path_template).observe(info.decode_time)
+
+    def record_conversion(self, step, class_name, count, seconds):
+        self.counter('pyparse_converted_objects_total', step=step, class_name=class_name).inc(count)
+        self.histogram('pyparse_conversion_seconds', step=step, class_name=class_name).observe(seconds)
+
+    def enable(self):
+        """Record requests and conversions of pyparse"""
+        add_request_hook(self.record_request)
+        add_conversion_hook(self.record_conversion)
+
+    def disable(self):
+        remove_request_hook(self.record_request)
+        remove_conversion_hook(self.record_conversion)
+
+
+registry = MetricsRegistry()
+"""The default registry. Call `registry.enable()` to start recording."""
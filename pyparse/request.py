@@ -14,21 +14,35 @@
 # limitations under the License.
 #
 
+import asyncio
 from copy import copy
 import json
+import time
+from urllib.parse import urlsplit
 
-import requests
-
-from pyparse import pyparse
-from pyparse.error import ParseInternalServerError, ParseError
+from pyparse import metrics, pyparse
+from pyparse.error import ParseInternalServerError, ParseError, ParseRateLimitError
 
 
 class Request(object):
 
+    # api.parse.com, used unless `pyparse.server_url` is set
     SCHEME = 'https'
     HOST = 'api.parse.com'
     VERSION = '1'
 
+    @classmethod
+    def server_url(cls):
+        """
+        >>> Request.server_url()
+        'https://api.parse.com/1'
+
+        :return: URL of the Parse server, including its mount path
+        :rtype: str
+        """
+        return pyparse.server_url or '{scheme}://{host}/{version}'.format(scheme=cls.SCHEME, host=cls.HOST,
+                                                                          version=cls.VERSION)
+
     @classmethod
     def generate_url(cls, path):
         """Generate URL used to request for object/collections
@@ -53,12 +67,21 @@ class Request(object):
         :return: a url string representing the object/collection at Parse's server
         :rtype: str
         """
-        return '{scheme}://{host}/{version}/{path}'.format(
-            scheme=cls.SCHEME,
-            host=cls.HOST,
-            version=cls.VERSION,
-            path=path.strip('/'),
-        )
+        return '{server_url}/{path}'.format(server_url=cls.server_url(), path=path.strip('/'))
+
+    @classmethod
+    def generate_path(cls, path):
+        """Generate the absolute path (with API version) of an object/collection, which is used by batch requests
+
+        >>> Request.generate_path('classes/TestClass/')
+        '/1/classes/TestClass'
+
+        :param path: the path of object/collection
+        :type path: str
+        :rtype: str
+        """
+        return '{mount_path}/{path}'.format(mount_path=urlsplit(cls.server_url()).path.rstrip('/'),
+                                            path=path.strip('/'))
 
     @staticmethod
     def authentication_headers():
@@ -86,7 +109,7 @@ class Request(object):
 
     # Object
 
-    def __init__(self, path, arguments=None, headers=None):
+    def __init__(self, path, arguments=None, headers=None, retry=None, priority=None):
         """Create a request instance
         :param path: Request path. The request path doesn't have to contains the API version.
                      for example, if you want to request `/1/installations`, just pass `installations` in.
@@ -95,6 +118,12 @@ class Request(object):
         :type: dict
         :param headers: Headers map used for this request
         :type: dict[str, str]
+        :param retry: True to retry this request on failures even if its verb isn't retried by default,
+                      False to never retry it, None to follow `pyparse.retry_policy`
+        :type: bool | None
+        :param priority: priority of this request when `pyparse.scheduler` is set, e.g. `BULK` of `pyparse.scheduler`.
+                         Defaults to the priority of the current context.
+        :type: str
         :return: A `Request` object instance
         :rtype: Request
         """
@@ -104,6 +133,10 @@ class Request(object):
         """:type: dict"""
         self._headers = headers or {}
         """:type: dict"""
+        self._retry = retry
+        """:type: bool | None"""
+        self._priority = priority
+        """:type: str"""
 
     @property
     def url(self):
@@ -171,7 +204,7 @@ class Request(object):
 
     # noinspection PyProtectedMember
     @staticmethod
-    def _request(verb, url, *args, **kwargs):
+    def _request(verb, url, retry=None, priority=None, path=None, **kwargs):
         """
 
         >>> from pyparse.request import Request
@@ -185,17 +218,99 @@ class Request(object):
         ...     str(e) == 'verb only accepts get, post, put, and delete'
         True
 
+        :param path: path of the request reported to `pyparse.metrics` hooks. Defaults to the path of `url`.
+        :type path: str
         :rtype: dict
         """
         assert verb in ('get', 'post', 'put', 'delete'), 'verb only accepts get, post, put, and delete'
 
-        response = getattr(requests, verb)(url, *args, **kwargs)
-        """:type: requests.models.Response"""
+        retry_policy = pyparse.retry_policy
+        retries = retry_policy.retries(verb, opt_in=retry)
+        attempt = 0
+        while True:
+            retry_after = None
+            if pyparse.scheduler:
+                pyparse.scheduler.acquire(priority)
+            info = Request._request_info(verb, url, path, attempt, kwargs) if metrics.request_hooks else None
+            try:
+                try:
+                    status_code, headers, body = pyparse.transport.request(verb, url, **kwargs)
+                except (ConnectionError, TimeoutError) as e:
+                    if info:
+                        info.failed(e)
+                    raise
+                retry_after = headers.get('Retry-After', None)
+                if info:
+                    info.received(status_code, body)
+                response_dict = Request._decode(body)
+                if info:
+                    info.decoded()
+                return Request._handle_response(status_code, response_dict)
+            except (ParseInternalServerError, ParseRateLimitError, ConnectionError, TimeoutError) as e:
+                delay = retry_policy.delay(verb, url, attempt, retries, e, retry_after=retry_after)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _request_info(verb, url, path, attempt, kwargs):
+        """
+        :rtype: pyparse.metrics.RequestInfo
+        """
+        if path is None:
+            path = urlsplit(url).path[len(urlsplit(Request.server_url()).path.rstrip('/')):]
+        return metrics.RequestInfo(verb, path, attempt=attempt, params=kwargs.get('params', None),
+                                   data=kwargs.get('data', None))
+
+    @staticmethod
+    def _decode(body):
+        """
+        >>> Request._decode(b'{"answer":42}')
+        {'answer': 42}
+        >>> Request._decode(b'<html>Bad Gateway</html>') is None
+        True
+
+        :type body: bytes
+        :return: the JSON object of a response body, or None if it isn't JSON
+        :rtype: dict | None
+        """
+        try:
+            return json.loads(body)
+        except ValueError:
+            # Error pages of proxies and load balancers in front of Parse are not JSON
+            return None
 
-        response_dict = response.json()
-        if response.status_code >= 500:
+    @staticmethod
+    def _handle_response(status_code, response_dict):
+        """
+        >>> Request._handle_response(200, {'answer': 42})
+        {'answer': 42}
+        >>> try:
+        ...     Request._handle_response(404, {'code': 101, 'error': 'object not found for get'})
+        ... except ParseError as e:
+        ...     e.code
+        101
+        >>> try:
+        ...     Request._handle_response(429, {'code': 155, 'error': 'request limit exceeded'})
+        ... except ParseRateLimitError as e:
+        ...     e.code
+        155
+
+        :type status_code: int
+        :type response_dict: dict | None
+        :rtype: dict
+        """
+        if response_dict is None:
+            if status_code < 400:
+                raise ValueError('Response of Parse is not a JSON object')
+            response_dict = {'code': 1, 'error': 'HTTP {}'.format(status_code)}
+
+        if status_code == 429 or status_code >= 400 and response_dict['code'] == 155:
+            raise ParseRateLimitError(response_dict['code'], response_dict['error'])
+        elif status_code >= 500:
             raise ParseInternalServerError(response_dict['code'], response_dict['error'])
-        elif response.status_code >= 400:
+        elif status_code >= 400:
             raise ParseError(response_dict['code'], response_dict['error'])
         else:
             return response_dict
@@ -206,28 +321,73 @@ class Request(object):
         """
         :rtype: dict
         """
-        return self._request('get', self.url, params=self.arguments(), headers=self.headers())
+        return self._request('get', self.url, retry=self._retry, priority=self._priority, path=self._path,
+                             params=self.arguments(), headers=self.headers())
 
     def post(self):
         """
         :rtype: dict
         """
-        return self._request('post', self.url, data=self.arguments(use_json=True), headers=self.headers(post=True))
+        return self._request('post', self.url, retry=self._retry, priority=self._priority, path=self._path,
+                             data=self.arguments(use_json=True), headers=self.headers(post=True))
 
     def put(self):
         """
         :rtype: dict
         """
-        return self._request('put', self.url, data=self.arguments(use_json=True), headers=self.headers(post=True))
+        return self._request('put', self.url, retry=self._retry, priority=self._priority, path=self._path,
+                             data=self.arguments(use_json=True), headers=self.headers(post=True))
 
     def delete(self):
         """
         :rtype: dict
         """
-        return self._request('delete', self.url, params=self.arguments(), headers=self.headers())
+        return self._request('delete', self.url, retry=self._retry, priority=self._priority, path=self._path,
+                             params=self.arguments(), headers=self.headers())
+
+
+class AsyncRequest(Request):
+    """A `Request` sent with the asyncio API. Its HTTP verb methods (inherited) return awaitables of `_request`."""
 
+    @staticmethod
+    async def _request(verb, url, retry=None, priority=None, path=None, **kwargs):
+        """
+        :rtype: dict
+        """
+        assert verb in ('get', 'post', 'put', 'delete'), 'verb only accepts get, post, put, and delete'
 
-def request_parse(verb, path, arguments=None, headers=None):
+        retry_policy = pyparse.retry_policy
+        retries = retry_policy.retries(verb, opt_in=retry)
+        attempt = 0
+        while True:
+            retry_after = None
+            if pyparse.scheduler:
+                await pyparse.scheduler.aacquire(priority)
+            info = Request._request_info(verb, url, path, attempt, kwargs) if metrics.request_hooks else None
+            try:
+                try:
+                    status_code, headers, body = await pyparse.async_transport.arequest(verb, url, **kwargs)
+                except (ConnectionError, TimeoutError, asyncio.TimeoutError) as e:
+                    if info:
+                        info.failed(e)
+                    raise
+                retry_after = headers.get('Retry-After', None)
+                if info:
+                    info.received(status_code, body)
+                response_dict = Request._decode(body)
+                if info:
+                    info.decoded()
+                return Request._handle_response(status_code, response_dict)
+            except (ParseInternalServerError, ParseRateLimitError, ConnectionError, TimeoutError,
+                    asyncio.TimeoutError) as e:
+                delay = retry_policy.delay(verb, url, attempt, retries, e, retry_after=retry_after)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def request_parse(verb, path, arguments=None, headers=None, retry=None, priority=None):
     """Request with Parse REST API
     :param verb: HTTP verb used for this request. (should be get, post, put, or delete)
     :type: str
@@ -237,8 +397,24 @@ def request_parse(verb, path, arguments=None, headers=None):
     :type: dict
     :param headers: headers used to request with a Parse object or collection
     :type: dict
+    :param retry: True to retry this request on failures even if its verb isn't retried by default (e.g. POST),
+                  False to never retry it, None to follow `pyparse.retry_policy`
+    :type: bool | None
+    :param priority: priority of this request when `pyparse.scheduler` is set
+    :type: str
+    :return: the response of this request
+    :rtype: dict
+    """
+    assert verb in ('get', 'post', 'put', 'delete'), 'verb only accepts get, post, put, and delete'
+    return getattr(Request(path=path, arguments=arguments, headers=headers, retry=retry, priority=priority), verb)()
+
+
+async def async_request_parse(verb, path, arguments=None, headers=None, retry=None, priority=None):
+    """Request with Parse REST API using asyncio. Arguments are the same as `request_parse`.
+
     :return: the response of this request
     :rtype: dict
     """
     assert verb in ('get', 'post', 'put', 'delete'), 'verb only accepts get, post, put, and delete'
-    return getattr(Request(path=path, arguments=arguments, headers=headers), verb)()
+    request = AsyncRequest(path=path, arguments=arguments, headers=headers, retry=retry, priority=priority)
+    return await getattr(request, verb)()
@@ -0,0 +1,157 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import math
+import random
+import threading
+
+
+class RetryPolicy(object):
+    """
+    Decide whether and when a failed request to Parse is retried.
+
+    Requests are retried on server errors, rate limiting and connection errors with exponential backoff and full
+    jitter, or after the delay given by a `Retry-After` header. Each verb has its own retry budget. By default only
+    idempotent GET and DELETE requests are retried; other verbs are retried only if the caller opts in.
+
+    >>> policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+    >>> policy.retries('get'), policy.retries('post'), policy.retries('post', opt_in=True)
+    (3, 0, 3)
+    >>> [policy.backoff(attempt) for attempt in range(4)]
+    [1, 2, 4, 5]
+    >>> policy.backoff(0, retry_after=3)
+    3.0
+    >>> policy.backoff(0, retry_after='-1'), policy.backoff(0, retry_after='nan'), policy.backoff(1, retry_after='inf')
+    (0.0, 1, 2)
+
+    Requests are retried by `pyparse.request`, e.g. against a server failing once:
+
+    >>> from pyparse import pyparse
+    >>> from pyparse.fake_server import FakeParseServer
+    >>> from pyparse.request import request_parse
+    >>> class OverloadedServer(FakeParseServer):
+    ...     overloaded = True
+    ...     def request(self, verb, url, **kwargs):
+    ...         if self.overloaded:
+    ...             self.overloaded = False
+    ...             return 503, {'Retry-After': '-1'}, b'{"code":1,"error":"overloaded"}'
+    ...         return super(OverloadedServer, self).request(verb, url, **kwargs)
+    >>> pyparse.setup_transport(OverloadedServer())
+    >>> pyparse.setup_retry_policy()
+    >>> request_parse('get', 'config'), pyparse.retry_policy.retry_count
+    ({'params': {}}, 1)
+    >>> pyparse.setup_transport(None)
+    """
+
+    default_max_retries = {'get': 3, 'delete': 3, 'post': 0, 'put': 0}
+
+    def __init__(self, max_retries=None, opt_in_retries=3, backoff_factor=0.5, max_backoff=30, jitter=True,
+                 on_retry=None):
+        """
+        :param max_retries: retry budget of each verb. Missing verbs use `default_max_retries`.
+        :type max_retries: dict[str, int]
+        :param opt_in_retries: retry budget of a request whose caller opts in, if its verb has no budget
+        :type opt_in_retries: int
+        :param backoff_factor: seconds to wait before the first retry. It's doubled for every following retry.
+        :type backoff_factor: float
+        :param max_backoff: max seconds to wait before a retry
+        :type max_backoff: float
+        :param jitter: wait for a random duration between 0 and the backoff instead of the full backoff
+        :type jitter: bool
+        :param on_retry: called with the verb, url, attempt number (from 1), delay in seconds and the error
+                         before waiting for each retry
+        :type on_retry: collections.Callable
+        """
+        self._max_retries = dict(self.default_max_retries, **(max_retries or {}))
+        """:type: dict[str, int]"""
+        self._opt_in_retries = opt_in_retries
+        """:type: int"""
+        self._backoff_factor = backoff_factor
+        """:type: float"""
+        self._max_backoff = max_backoff
+        """:type: float"""
+        self._jitter = jitter
+        """:type: bool"""
+        self._on_retry = on_retry
+
+        self._lock = threading.Lock()
+        self.retry_count = 0
+        """:type: int"""
+        self.backoff_time = 0.0
+        """:type: float"""
+
+    def retries(self, verb, opt_in=None):
+        """
+        :param verb: HTTP verb of the request
+        :type verb: str
+        :param opt_in: True to retry the request even if its verb isn't retried by default, False to never retry it
+        :type opt_in: bool | None
+        :return: max number of retries of the request
+        :rtype: int
+        """
+        if opt_in is False:
+            return 0
+        retries = self._max_retries.get(verb, 0)
+        if opt_in and not retries:
+            retries = self._opt_in_retries
+        return retries
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        :param attempt: number of retries already done
+        :type attempt: int
+        :param retry_after: value of the `Retry-After` header of the failed response
+        :type retry_after: str | None
+        :return: seconds to wait before the next retry
+        :rtype: float
+        """
+        if retry_after is not None:
+            try:
+                retry_after = float(retry_after)
+            except ValueError:
+                retry_after = None  # HTTP-date isn't supported. Use the normal backoff.
+            if retry_after is not None and math.isfinite(retry_after):
+                return max(0.0, min(retry_after, self._max_backoff))
+
+        backoff = min(self._backoff_factor * 2 ** attempt, self._max_backoff)
+        return random.uniform(0, backoff) if self._jitter else backoff
+
+    def delay(self, verb, url, attempt, retries, error, retry_after=None):
+        """Decide whether a failed request is retried and report it
+
+        :type verb: str
+        :type url: str
+        :param attempt: number of retries already done
+        :type attempt: int
+        :param retries: max number of retries of the request
+        :type retries: int
+        :param error: error of the failed attempt
+        :type error: Exception
+        :param retry_after: value of the `Retry-After` header of the failed response
+        :type retry_after: str | None
+        :return: seconds to wait before retrying, or None if the request shouldn't be retried
+        :rtype: float | None
+        """
+        if attempt >= retries:
+            return None
+
+        delay = self.backoff(attempt, retry_after=retry_after)
+        with self._lock:
+            self.retry_count += 1
+            self.backoff_time += delay
+        if self._on_retry:
+            self._on_retry(verb, url, attempt + 1, delay, error)
+        return delay
@@ -0,0 +1,254 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+
+_priority = ContextVar('pyparse_request_priority', default=None)
+
+
+@contextmanager
+def priority(request_priority):
+    """Send requests made in this context (thread or asyncio task) with `request_priority`
+
+    >>> current_priority()
+    'interactive'
+    >>> with priority(BULK):
+    ...     current_priority()
+    'bulk'
+
+    :type request_priority: str
+    """
+    token = _priority.set(request_priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority():
+    """
+    :return: priority of requests made in the current context
+    :rtype: str
+    """
+    return _priority.get() or INTERACTIVE
+
+
+class TokenBucket(object):
+    """
+    Allow `rate` operations per second on average, and bursts of up to `capacity` operations.
+
+    >>> now = [0.0]
+    >>> bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+    >>> bucket.take(), bucket.take(), bucket.take()
+    (0, 0, 0.5)
+    >>> now[0] = 0.5
+    >>> bucket.take()
+    0
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        """
+        :param rate: tokens added per second
+        :type rate: float
+        :param capacity: max number of tokens kept. Defaults to `rate` (i.e. one second of burst).
+        :type capacity: float
+        :param clock: function returning the current time in seconds
+        :type clock: collections.Callable
+        """
+        assert rate > 0, 'rate should be positive'
+        self._rate = rate
+        """:type: float"""
+        self._capacity = max(capacity or rate, 1)
+        """:type: float"""
+        self._clock = clock
+
+        self._tokens = self._capacity
+        """:type: float"""
+        self._updated_at = clock()
+        """:type: float"""
+
+    def take(self):
+        """Take a token if there's one. Not thread-safe; callers should lock.
+
+        :return: 0 if a token was taken, otherwise seconds until the next token is available
+        :rtype: float
+        """
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self._rate
+
+
+class RequestScheduler(object):
+    """
+    Limit the rate of requests to Parse with a token bucket shared by the whole process, and share it between priority
+    classes with weighted fair queuing: when requests of several priorities are waiting, each priority gets tokens in
+    proportion to its weight, so bulk jobs can't starve interactive requests (and vice versa).
+    """
+
+    default_weights = {INTERACTIVE: 4, BULK: 1}
+
+    # Seconds between checks of an asyncio waiter which isn't at the head of the queue
+    async_poll_interval = 0.005
+
+    def __init__(self, rate, burst=None, weights=None):
+        """
+        :param rate: max requests per second
+        :type rate: float
+        :param burst: max requests sent at once after being idle. Defaults to `rate`.
+        :type burst: float
+        :param weights: share of requests of each priority when all of them are waiting
+        :type weights: dict[str, float]
+        """
+        self._bucket = TokenBucket(rate, capacity=burst)
+        self._weights = dict(self.default_weights, **(weights or {}))
+        """:type: dict[str, float]"""
+
+        self._condition = threading.Condition()
+        self._queues = {p: deque() for p in self._weights}
+        """:type: dict[str, deque]"""
+        self._virtual_times = {p: 0.0 for p in self._weights}
+        """:type: dict[str, float]"""
+        self._virtual_time = 0.0
+
+        self._requests = {p: 0 for p in self._weights}
+        """:type: dict[str, int]"""
+        self._wait_times = {p: 0.0 for p in self._weights}
+        """:type: dict[str, float]"""
+        self._max_wait_times = {p: 0.0 for p in self._weights}
+        """:type: dict[str, float]"""
+
+    def _enqueue(self, request_priority):
+        """
+        :type request_priority: str
+        :rtype: object
+        """
+        assert request_priority in self._queues, 'Unknown priority: {}'.format(request_priority)
+        queue = self._queues[request_priority]
+        if not queue:
+            # A priority which was idle doesn't get credit for the time it was idle
+            self._virtual_times[request_priority] = max(self._virtual_times[request_priority], self._virtual_time)
+        ticket = object()
+        queue.append(ticket)
+        return ticket
+
+    def _try_serve(self, request_priority, ticket):
+        """Must be called with the condition locked
+
+        :return: 0 if the ticket is served, otherwise seconds to wait before trying again (None if unknown)
+        :rtype: float | None
+        """
+        next_priority = min((p for p, q in self._queues.items() if q),
+                            key=lambda p: self._virtual_times[p] + 1 / self._weights[p])
+        if next_priority != request_priority or self._queues[request_priority][0] is not ticket:
+            return None
+
+        wait = self._bucket.take()
+        if wait:
+            return wait
+
+        self._queues[request_priority].popleft()
+        self._virtual_time = self._virtual_times[request_priority]
+        self._virtual_times[request_priority] += 1 / self._weights[request_priority]
+        self._condition.notify_all()
+        return 0
+
+    def _abandon(self, request_priority, ticket):
+        """Remove a ticket of a waiter which was interrupted. Must be called with the condition locked."""
+        try:
+            self._queues[request_priority].remove(ticket)
+        except ValueError:
+            pass
+        self._condition.notify_all()
+
+    def _did_serve(self, request_priority, wait_time):
+        self._requests[request_priority] += 1
+        self._wait_times[request_priority] += wait_time
+        self._max_wait_times[request_priority] = max(self._max_wait_times[request_priority], wait_time)
+
+    def acquire(self, request_priority=None):
+        """Block until a request of `request_priority` may be sent
+
+        :param request_priority: defaults to the priority of the current context
+        :type request_priority: str
+        :return: seconds waited
+        :rtype: float
+        """
+        request_priority = request_priority or current_priority()
+        started_at = time.monotonic()
+        with self._condition:
+            ticket = self._enqueue(request_priority)
+            try:
+                while True:
+                    wait = self._try_serve(request_priority, ticket)
+                    if wait == 0:
+                        break
+                    self._condition.wait(wait)
+            except BaseException:
+                self._abandon(request_priority, ticket)
+                raise
+            wait_time = time.monotonic() - started_at
+            self._did_serve(request_priority, wait_time)
+        return wait_time
+
+    async def aacquire(self, request_priority=None):
+        """Same as `acquire`, but waits without blocking the event loop
+
+        :type request_priority: str
+        :rtype: float
+        """
+        request_priority = request_priority or current_priority()
+        started_at = time.monotonic()
+        with self._condition:
+            ticket = self._enqueue(request_priority)
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_serve(request_priority, ticket)
+                    if wait == 0:
+                        wait_time = time.monotonic() - started_at
+                        self._did_serve(request_priority, wait_time)
+                        return wait_time
+                await asyncio.sleep(wait or self.async_poll_interval)
+        except BaseException:
+            with self._condition:
+                self._abandon(request_priority, ticket)
+            raise
+
+    @property
+    def stats(self):
+        """
+        :return: queue depth, number of served requests, total and max wait time (in seconds) of each priority
+        :rtype: dict[str, dict[str, float]]
+        """
+        with self._condition:
+            return {p: {
+                'queue_depth': len(self._queues[p]),
+                'requests': self._requests[p],
+                'wait_time': self._wait_times[p],
+                'max_wait_time': self._max_wait_times[p],
+            } for p in self._weights}
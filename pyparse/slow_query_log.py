@@ -0,0 +1,233 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections import deque
+from contextvars import ContextVar
+import datetime
+import json
+import random
+import threading
+import time
+
+from pyparse import metrics
+
+_current_trace = ContextVar('pyparse_slow_query_trace', default=None)
+
+
+def _shape(value):
+    """Replace the values of a where dict by '?', so queries differing only by values can be grouped
+
+    >>> _shape({'name': 'Taipei', 'population': {'$gte': 1000000}, '$or': [{'a': 1}, {'b': 2}]})
+    {'name': '?', 'population': {'$gte': '?'}, '$or': [{'a': '?'}, {'b': '?'}]}
+    """
+    if isinstance(value, dict):
+        if '__type' in value:
+            return '?'
+        return {key: _shape(sub_value) for key, sub_value in value.items()}
+    elif isinstance(value, list) and value and isinstance(value[0], dict):
+        return [_shape(sub_value) for sub_value in value]
+    return '?'
+
+
+class _NullTrace(object):
+    """Used instead of a trace when a query isn't sampled"""
+
+    __slots__ = ()
+
+    rows = property(lambda self: None, lambda self, rows: None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_null_trace = _NullTrace()
+
+
+class _Trace(object):
+    """Time spent by one query. Requests and conversions done while it's entered are added to it."""
+
+    def __init__(self, log, operation, class_name, arguments):
+        self.log = log
+        """:type: SlowQueryLog"""
+        self.operation = operation
+        self.class_name = class_name
+        self.arguments = arguments
+        self.rows = None
+        """Number of objects returned, set by the query"""
+        self.requests = 0
+        self.request_time = 0.0
+        self.decode_time = 0.0
+        self.from_parse_time = 0.0
+        self.response_bytes = 0
+        self._started_at = None
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_trace.set(self)
+        self._started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        total_time = time.perf_counter() - self._started_at
+        _current_trace.reset(self._token)
+        if total_time >= self.log.threshold:
+            self.log.add(self._record(total_time, exc_value))
+        return False
+
+    def _record(self, total_time, error=None):
+        """
+        :rtype: dict
+        """
+        arguments = self.arguments or {}
+        where = arguments.get('where', None)
+        if isinstance(where, str):
+            where = json.loads(where)
+        return {
+            'time': datetime.datetime.utcnow().isoformat() + 'Z',
+            'operation': self.operation,
+            'class_name': self.class_name,
+            'where': where,
+            'shape': _shape(where) if where else None,
+            'order': arguments.get('order', None),
+            'limit': arguments.get('limit', None),
+            'skip': arguments.get('skip', None),
+            'rows': self.rows,
+            'requests': self.requests,
+            'response_bytes': self.response_bytes,
+            'total_time': total_time,
+            'request_time': self.request_time,
+            'decode_time': self.decode_time,
+            'from_parse_time': self.from_parse_time,
+            'error': repr(error) if error is not None else None,
+        }
+
+
+class SlowQueryLog(object):
+    """
+    Record queries taking longer than a threshold, with where their time went: requests to Parse, decoding JSON
+    responses and converting objects (`from_parse`). Enable it with `pyparse.setup_slow_query_log`.
+
+    Records are kept in a ring buffer of the latest `capacity` ones, and written as JSON lines to `sink` if given.
+    Only a `sample_rate` fraction of queries is traced, so the overhead stays bounded under high load.
+
+    >>> log = SlowQueryLog(threshold=0)
+    >>> with log.trace('fetch', 'City', {'where': '{"name":"Taipei"}', 'limit': 10}) as trace:
+    ...     trace.rows = 1
+    >>> record = log.records()[0]
+    >>> record['class_name'], record['where'], record['shape'], record['limit'], record['rows']
+    ('City', {'name': 'Taipei'}, {'name': '?'}, 10, 1)
+    """
+
+    def __init__(self, threshold=1.0, capacity=100, sample_rate=1.0, sink=None):
+        """
+        :param threshold: seconds above which a query is recorded
+        :type threshold: float
+        :param capacity: number of records kept in memory
+        :type capacity: int
+        :param sample_rate: fraction of queries which are traced, between 0 and 1
+        :type sample_rate: float
+        :param sink: path of a file, or a file object, to which records are appended as JSON lines
+        :type sink: str | io.TextIOBase | None
+        """
+        self.threshold = threshold
+        """:type: float"""
+        self.sample_rate = sample_rate
+        """:type: float"""
+        self._records = deque(maxlen=capacity)
+        """:type: collections.deque[dict]"""
+        self._sink = sink
+        """:type: str | io.TextIOBase | None"""
+        self._lock = threading.Lock()
+
+    def trace(self, operation, class_name, arguments=None):
+        """Trace a query, unless it isn't sampled. Use the result as a context manager around the query, and set its
+        `rows` to the number of objects returned.
+
+        :param operation: e.g. 'fetch' or 'count'
+        :type operation: str
+        :type class_name: str
+        :param arguments: arguments of the request of the query (see `Query.get_arguments`)
+        :type arguments: dict | None
+        """
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return _null_trace
+        return _Trace(self, operation, class_name, arguments)
+
+    def add(self, record):
+        """
+        :type record: dict
+        """
+        with self._lock:
+            self._records.append(record)
+            if self._sink is not None:
+                line = json.dumps(record, sort_keys=True, default=str) + '\n'
+                if isinstance(self._sink, str):
+                    with open(self._sink, 'a') as f:
+                        f.write(line)
+                else:
+                    self._sink.write(line)
+                    self._sink.flush()
+
+    def records(self):
+        """
+        :return: the latest records, oldest first
+        :rtype: list[dict]
+        """
+        with self._lock:
+            return list(self._records)
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    # Hooks
+
+    def _on_request(self, info):
+        """
+        :type info: pyparse.metrics.RequestInfo
+        """
+        trace = _current_trace.get()
+        if trace is not None and trace.log is self:
+            trace.requests += 1
+            trace.request_time += info.network_time
+            if info.error is None:
+                trace.decode_time += info.decode_time
+                trace.response_bytes += info.response_bytes
+
+    def _on_conversion(self, step, class_name, count, seconds):
+        trace = _current_trace.get()
+        if trace is not None and trace.log is self:
+            trace.from_parse_time += seconds
+
+    def enable(self):
+        metrics.add_request_hook(self._on_request)
+        metrics.add_conversion_hook(self._on_conversion)
+
+    def disable(self):
+        metrics.remove_request_hook(self._on_request)
+        metrics.remove_conversion_hook(self._on_conversion)
+
+
+def trace_query(slow_query_log, operation, class_name, arguments=None):
+    """Trace a query with `slow_query_log` if it's set
+
+    :type slow_query_log: SlowQueryLog | None
+    :rtype: contextlib.AbstractContextManager
+    """
+    return slow_query_log.trace(operation, class_name, arguments) if slow_query_log else _null_trace
@@ -0,0 +1,389 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import http.client
+import socket
+import threading
+from urllib.parse import urlencode, urlsplit
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class Transport(object):
+    """
+    Sends requests to Parse REST API. Select one with `pyparse.setup_transport`.
+
+    A transport returns the status code, headers and body (bytes, decoded by `Request`) of a response, and raises
+    `ConnectionError` or `TimeoutError` if no response could be read, so requests can be retried the same way
+    whichever transport is used.
+    """
+
+    def request(self, verb, url, params=None, data=None, headers=None):
+        """
+        :type verb: str
+        :type url: str
+        :param params: arguments sent in the query string
+        :type params: dict
+        :param data: JSON body
+        :type data: str
+        :type headers: dict[str, str]
+        :return: status code, headers and body of the response
+        :rtype: (int, collections.Mapping[str, str], bytes)
+        """
+        raise NotImplementedError
+
+    async def arequest(self, verb, url, params=None, data=None, headers=None):
+        """Same as `request` for the asyncio API. By default `request` is run in the default executor of the loop.
+
+        :rtype: (int, collections.Mapping[str, str], bytes)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.request(verb, url, params=params, data=data,
+                                                                     headers=headers))
+
+    def close(self):
+        """Close open connections. The transport stays usable."""
+        pass
+
+    async def aclose(self):
+        """Same as `close` for the asyncio API"""
+        self.close()
+
+
+class SessionPool(Transport):
+    """
+    Keep one `requests.Session` (and its connection pool) per host, so connections to Parse are reused across requests
+    instead of doing a new TCP+TLS handshake every time.
+
+    A pool is safe to share across threads. Sessions are created lazily on first use of a host.
+
+    >>> pool = SessionPool(pool_maxsize=4)
+    >>> pool.session('https://api.parse.com/1/config') is pool.session('https://api.parse.com/1/classes/A')
+    True
+    >>> pool.session('https://api.parse.com/1/config') is pool.session('http://localhost:1337/1/config')
+    False
+    >>> pool.close()
+    >>> len(pool)
+    0
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True):
+        """
+        :param pool_connections: number of per-host connection pools to cache
+        :type pool_connections: int
+        :param pool_maxsize: maximum number of connections kept alive per host
+        :type pool_maxsize: int
+        :param pool_block: block when all connections of a host are in use instead of opening a throwaway one
+        :type pool_block: bool
+        :param keep_alive: keep connections open after a response has been read
+        :type keep_alive: bool
+        """
+        self._pool_connections = pool_connections
+        """:type: int"""
+        self._pool_maxsize = pool_maxsize
+        """:type: int"""
+        self._pool_block = pool_block
+        """:type: bool"""
+        self._keep_alive = keep_alive
+        """:type: bool"""
+
+        self._sessions = {}
+        """:type: dict[(str, str), requests.Session]"""
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self._pool_connections,
+                              pool_maxsize=self._pool_maxsize,
+                              pool_block=self._pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not self._keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def session(self, url):
+        """Get the session used to request `url`
+
+        :type url: str
+        :rtype: requests.Session
+        """
+        scheme, host = urlsplit(url)[:2]
+        session = self._sessions.get((scheme, host), None)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get((scheme, host), None)
+                if session is None:
+                    session = self._create_session()
+                    self._sessions[(scheme, host)] = session
+        return session
+
+    def request(self, verb, url, params=None, data=None, headers=None):
+        """
+        :type verb: str
+        :type url: str
+        :type params: dict
+        :type data: str
+        :type headers: dict[str, str]
+        :rtype: (int, collections.Mapping[str, str], bytes)
+        """
+        try:
+            response = self.session(url).request(verb.upper(), url, params=params, data=data, headers=headers)
+        except requests.Timeout as e:
+            raise TimeoutError(str(e)) from e
+        except requests.ConnectionError as e:
+            raise ConnectionError(str(e)) from e
+        return response.status_code, response.headers, response.content
+
+    def close(self):
+        """Close all pooled connections. The pool stays usable and opens new sessions on demand."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+class HTTPClientTransport(Transport):
+    """
+    Send requests with the standard library's `http.client`, keeping one persistent connection per host and thread.
+    It has less overhead per request than `requests`, and no dependency.
+
+    A GET or DELETE request is sent again once if the server has closed the kept-alive connection it was sent on.
+    Requests of other verbs raise `ConnectionError`, so whether they're retried is up to `pyparse.retry.RetryPolicy`:
+
+    >>> from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    >>> class ForgetfulHandler(BaseHTTPRequestHandler):
+    ...     protocol_version = 'HTTP/1.1'
+    ...     received = []
+    ...     def handle_one_request(self):
+    ...         super(ForgetfulHandler, self).handle_one_request()
+    ...         self.close_connection = True  # without telling the client
+    ...     def do_GET(self):
+    ...         self.received.append(self.command)
+    ...         self.send_response(200)
+    ...         self.send_header('Content-Length', '2')
+    ...         self.end_headers()
+    ...         self.wfile.write(b'{}')
+    ...     do_POST = do_GET
+    ...     def log_message(self, *args):
+    ...         pass
+    >>> server = ThreadingHTTPServer(('127.0.0.1', 0), ForgetfulHandler)
+    >>> threading.Thread(target=server.serve_forever, daemon=True).start()
+    >>> url = 'http://127.0.0.1:{}/1/classes/City'.format(server.server_port)
+    >>> transport = HTTPClientTransport(timeout=5)
+    >>> [transport.request('get', url)[0] for _ in range(2)]
+    [200, 200]
+    >>> try:
+    ...     transport.request('post', url, data='{"name":"Taipei"}')
+    ... except ConnectionError:
+    ...     ForgetfulHandler.received
+    ['GET', 'GET']
+    >>> transport.request('post', url, data='{"name":"Taipei"}')[0], ForgetfulHandler.received
+    (200, ['GET', 'GET', 'POST'])
+    >>> transport.close()
+    >>> server.shutdown()
+    >>> server.server_close()
+    """
+
+    _resent_verbs = frozenset(('get', 'head', 'delete', 'options'))
+    """Idempotent verbs, whose requests are sent again on a new connection if a kept-alive one was closed"""
+
+    def __init__(self, timeout=None):
+        """
+        :param timeout: seconds to wait for connecting and for each read, or None to wait forever
+        :type timeout: float | None
+        """
+        self._timeout = timeout
+        """:type: float | None"""
+        self._local = threading.local()
+
+    def _connection(self, scheme, host):
+        """
+        :rtype: http.client.HTTPConnection
+        """
+        connections = self._local.__dict__.setdefault('connections', {})
+        connection = connections.get((scheme, host), None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            connection = connection_class(host, timeout=self._timeout)
+            connections[(scheme, host)] = connection
+        return connection
+
+    def request(self, verb, url, params=None, data=None, headers=None):
+        """
+        :type verb: str
+        :type url: str
+        :type params: dict
+        :type data: str
+        :type headers: dict[str, str]
+        :rtype: (int, collections.Mapping[str, str], bytes)
+        """
+        scheme, host, path, query, _ = urlsplit(url)
+        if params:
+            query = '&'.join(filter(None, (query, urlencode(params))))
+        target = '{}?{}'.format(path, query) if query else path
+        body = data.encode() if isinstance(data, str) else data
+        headers = {key: str(value) for key, value in (headers or {}).items()}
+
+        connection = self._connection(scheme, host)
+        reused = connection.sock is not None
+        try:
+            try:
+                connection.request(verb.upper(), target, body=body, headers=headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed a kept-alive connection. Retry once on a new connection, unless the request may
+                # have been applied: other verbs are left to the retry policy.
+                connection.close()
+                if not reused or verb.lower() not in self._resent_verbs:
+                    raise
+                connection.request(verb.upper(), target, body=body, headers=headers)
+                response = connection.getresponse()
+            content = response.read()
+        except socket.timeout as e:
+            connection.close()
+            raise TimeoutError(str(e)) from e
+        except (OSError, http.client.HTTPException) as e:
+            connection.close()
+            raise ConnectionError(str(e)) from e
+        return response.status, response.headers, content
+
+    def close(self):
+        """Close the connections of the calling thread"""
+        for connection in self._local.__dict__.pop('connections', {}).values():
+            connection.close()
+
+
+class AsyncSessionPool(Transport):
+    """
+    Pool of `aiohttp.ClientSession`s used by the asyncio API. One session (and its connection pool) is kept per event
+    loop, and the number of requests in flight per loop is bounded by `max_concurrency`.
+
+    A session is closed when its loop shuts down its async generators, which `asyncio.run` does before closing the
+    loop. A loop closed without `loop.shutdown_asyncgens()` should await `aclose` (or `pyparse.aclose`) first.
+
+    Requires `aiohttp` (`pip install pyparse[async]`).
+
+    >>> pool = AsyncSessionPool()
+    >>> async def session_closed_by_loop():
+    ...     return (await pool._session())[0]
+    >>> sessions = [asyncio.run(session_closed_by_loop()) for _ in range(3)]
+    >>> [session.closed for session in sessions], len(pool._sessions)
+    ([True, True, True], 1)
+    """
+
+    def __init__(self, limit=100, limit_per_host=0, max_concurrency=100, keep_alive=True):
+        """
+        :param limit: maximum number of open connections
+        :type limit: int
+        :param limit_per_host: maximum number of open connections per host (0 means no limit)
+        :type limit_per_host: int
+        :param max_concurrency: maximum number of requests in flight
+        :type max_concurrency: int
+        :param keep_alive: keep connections open after a response has been read
+        :type keep_alive: bool
+        """
+        if aiohttp is None:
+            raise ImportError('aiohttp is required to use the asyncio API of pyparse')
+
+        self._limit = limit
+        """:type: int"""
+        self._limit_per_host = limit_per_host
+        """:type: int"""
+        self._max_concurrency = max_concurrency
+        """:type: int"""
+        self._keep_alive = keep_alive
+        """:type: bool"""
+
+        self._sessions = weakref.WeakKeyDictionary()
+        """Session, semaphore and closer (see `_closer`) by loop
+
+        :type: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, (aiohttp.ClientSession, asyncio.Semaphore,
+                                                                    collections.AsyncGenerator)]"""
+
+    async def _session(self):
+        """
+        :rtype: (aiohttp.ClientSession, asyncio.Semaphore, collections.AsyncGenerator)
+        """
+        loop = asyncio.get_running_loop()
+        pooled_session = self._sessions.get(loop, None)
+        if pooled_session is None or pooled_session[0].closed:
+            # Sessions keep their loop alive, so entries of closed loops are dropped here
+            for closed_loop in [other_loop for other_loop in list(self._sessions) if other_loop.is_closed()]:
+                self._sessions.pop(closed_loop, None)
+
+            connector = aiohttp.TCPConnector(limit=self._limit, limit_per_host=self._limit_per_host,
+                                             force_close=not self._keep_alive)
+            session = aiohttp.ClientSession(connector=connector)
+            closer = self._closer(session)
+            await closer.asend(None)
+            pooled_session = (session, asyncio.Semaphore(self._max_concurrency), closer)
+            self._sessions[loop] = pooled_session
+        return pooled_session
+
+    @staticmethod
+    async def _closer(session):
+        """An async generator closing `session` when it's finalized. Started in a loop, it's finalized by
+        `loop.shutdown_asyncgens()`, so the session is closed before the loop.
+
+        :type session: aiohttp.ClientSession
+        """
+        try:
+            yield
+        finally:
+            await session.close()
+
+    def request(self, verb, url, params=None, data=None, headers=None):
+        raise NotImplementedError('{} only supports the asyncio API'.format(self.__class__.__name__))
+
+    async def arequest(self, verb, url, params=None, **kwargs):
+        """
+        :type verb: str
+        :type url: str
+        :type params: dict
+        :return: status code, headers and body of the response
+        :rtype: (int, collections.Mapping[str, str], bytes)
+        """
+        if params:
+            # aiohttp only accepts str values in query strings
+            params = {key: value if isinstance(value, str) else str(value) for key, value in params.items()}
+
+        session, semaphore, _ = await self._session()
+        async with semaphore:
+            try:
+                async with session.request(verb.upper(), url, params=params, **kwargs) as response:
+                    return response.status, response.headers, await response.read()
+            except aiohttp.ClientConnectionError as e:
+                raise ConnectionError(str(e)) from e
+
+    async def aclose(self):
+        """Close the session of the running event loop. Only needed if the loop is closed without shutting down its
+        async generators (`asyncio.run` does)."""
+        pooled_session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if pooled_session:
+            await pooled_session[2].aclose()
@@ -0,0 +1,119 @@
+#
+# Copyright 2015 Tickle Labs, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class LRUCache(object):
+    """
+    A thread-safe cache which evicts the least recently used entry when it's full, and optionally expires entries after
+    `ttl` seconds.
+
+    >>> cache = LRUCache(max_size=2)
+    >>> cache.set('a', 1)
+    >>> cache.set('b', 2)
+    >>> cache.get('a')
+    1
+    >>> cache.set('c', 3)
+    >>> cache.get('b') is None
+    True
+    >>> cache.stats == {'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2}
+    True
+    """
+
+    def __init__(self, max_size=1000, ttl=None, clock=time.monotonic):
+        """
+        :param max_size: max number of entries
+        :type max_size: int
+        :param ttl: seconds before an entry expires, or None to keep entries until they are evicted
+        :type ttl: float | None
+        :param clock: function returning the current time in seconds
+        :type clock: collections.Callable
+        """
+        assert isinstance(max_size, int) and max_size > 0, 'max_size should be a positive integer'
+
+        self._max_size = max_size
+        """:type: int"""
+        self._ttl = ttl
+        """:type: float | None"""
+        self._clock = clock
+
+        self._entries = OrderedDict()
+        """:type: OrderedDict[object, (object, float | None)]"""
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        """:type: int"""
+        self.misses = 0
+        """:type: int"""
+        self.evictions = 0
+        """:type: int"""
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None and (entry[1] is None or entry[1] > self._clock()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires_at = self._clock() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_where(self, predicate):
+        """Drop all entries whose key satisfies `predicate`
+
+        :type predicate: collections.Callable
+        """
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self):
+        """
+        :rtype: dict[str, int]
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+        }
@@ -31,6 +31,10 @@ setup(name='pyparse',
       install_requires=[
           'requests>=2.6.0',
       ],
+      extras_require={
+          'async': ['aiohttp>=3.0'],
+          'columns': ['numpy'],
+      },
       classifiers=[
           'Development Status :: 3 - Alpha',
           'Environment :: Console',